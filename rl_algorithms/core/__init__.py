@@ -2,7 +2,8 @@
 
 from . import algorithms
 from . import rl_env
+from . import buffers
 from .events import EventType  # 예시: events.py 내부 클래스/함수명
 
 # 필요하다면 __all__ 정의
-__all__ = ["algorithms", "rl_env", "EventType"]
\ No newline at end of file
+__all__ = ["algorithms", "rl_env", "buffers", "EventType"]
\ No newline at end of file
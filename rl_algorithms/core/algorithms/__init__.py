@@ -1,5 +1,18 @@
 # rl_algorithms/core/algorithms/__init__.py
-from .base import RLAlgorithm, GeneralizedPolicyIteration
+from .base import RLAlgorithm, GeneralizedPolicyIteration, TemporalDifferenceLearning
 from .policy_iteration import PolicyIteration
+from .modified_policy_iteration import ModifiedPolicyIteration
 from .value_iteration import ValueIteration
-__all__ = ["RLAlgorithm", "GeneralizedPolicyIteration", "PolicyIteration", "ValueIteration"]
\ No newline at end of file
+from .prioritized_sweeping import PrioritizedSweeping
+from .batch_value_iteration import BatchValueIteration
+from .goal_value_iteration import GoalConditionedValueIteration
+from .bellman import TabularBellmanOperator, StencilBellmanOperator
+from .parallel_sweep import SharedMemorySweepEngine
+from .policy_sampler import PolicySampler
+from .q_learning import QLearning
+from .sarsa import SARSA
+__all__ = ["RLAlgorithm", "GeneralizedPolicyIteration", "TemporalDifferenceLearning",
+           "PolicyIteration", "ValueIteration", "ModifiedPolicyIteration", "PrioritizedSweeping",
+           "BatchValueIteration", "GoalConditionedValueIteration", "TabularBellmanOperator",
+           "StencilBellmanOperator", "SharedMemorySweepEngine", "PolicySampler", "QLearning",
+           "SARSA"]
@@ -1,6 +1,11 @@
+import time
 from abc import ABC, abstractmethod
 import numpy as np
 from rl_algorithms.core.rl_env.grid_world import GridWorld
+from rl_algorithms.core.rl_env.vector_grid_world import VectorGridWorld
+from rl_algorithms.core.algorithms.bellman import TabularBellmanOperator, StencilBellmanOperator
+from rl_algorithms.core.algorithms.parallel_sweep import SharedMemorySweepEngine
+from rl_algorithms.core.algorithms.policy_sampler import PolicySampler
 
 
 class RLAlgorithm(ABC):
@@ -17,12 +22,26 @@ class RLAlgorithm(ABC):
         The environment the algorithm interacts with.
     gamma : float
         Discount factor for future rewards.
+    dtype : np.dtype
+        Floating point type of the values, policy and Q-values, taken from
+        `env.dtype`.
     rng : np.random.RandomState
         Random number generator for reproducibility.
     values : np.ndarray
         Array representing the value function of each state.
     policy : np.ndarray
-        Array representing the current policy probabilities for each state-action pair.
+        Read-only array representing the current policy probabilities for
+        each state-action pair; assign a new array to change it. For
+        deterministic policies it is expanded from `policy_actions`.
+    policy_actions : np.ndarray or None
+        Compact deterministic policy holding one action per state, or None
+        while the policy is stochastic. States without a chosen action hold
+        -1 and act uniformly at random.
+    policy_version : int
+        Counter incremented every time the policy changes.
+    policy_sampler : PolicySampler
+        Action sampling table of the current policy, rebuilt when
+        `policy_version` changes.
     q_values : np.ndarray
         Array representing the Q-values for each state-action pair.
     """
@@ -41,9 +60,11 @@ class RLAlgorithm(ABC):
             Random seed for reproducibility (default is 42).
         """
         self.env = env
-        self.gamma = gamma
+        self.gamma = float(gamma)
+        self.dtype = env.dtype
         self.rng = np.random.RandomState(seed)
         self.reset()
+        env.add_observer(self)
 
     def reset(self) -> None:
         """
@@ -56,13 +77,339 @@ class RLAlgorithm(ABC):
         -------
         None
         """
-        self.values = np.zeros(self.env.n_states)
+        self.values = np.zeros(self.env.n_states, dtype=self.dtype)
         # Uniform initial policy
         self.policy = np.full(
             (self.env.n_states, len(self.env.actions)),
-            1.0 / len(self.env.actions)
+            1.0 / len(self.env.actions), dtype=self.dtype
         )
-        self.q_values = np.zeros((self.env.n_states, len(self.env.actions)))
+        self.q_values = np.zeros((self.env.n_states, len(self.env.actions)), dtype=self.dtype)
+
+    def get_solution(self) -> dict:
+        """
+        Copy the current solution, to warm-start a later solve.
+
+        Returns
+        -------
+        dict
+            ``'values'``, ``'q_values'`` and ``'policy'``, the policy being
+            one action per state if it is deterministic and action
+            probabilities otherwise.
+        """
+        policy = self.policy_actions if self.is_deterministic else self.policy
+        return {
+            'values': self.values.copy(),
+            'q_values': self.q_values.copy(),
+            'policy': policy.copy(),
+        }
+
+    def warm_start(self, source=None, values: np.ndarray = None, q_values: np.ndarray = None,
+                   policy: np.ndarray = None) -> None:
+        """
+        Seed the values, Q-values and policy from a prior solution.
+
+        The arrays are copied into the algorithm's own arrays, converted to
+        its `dtype`. Anything not given keeps its current content.
+
+        Parameters
+        ----------
+        source : RLAlgorithm or dict, optional
+            Another algorithm on an environment with the same layout, or a
+            solution returned by `get_solution`. Its arrays are used unless
+            given explicitly.
+        values : np.ndarray, optional
+            State values, shaped (S,).
+        q_values : np.ndarray, optional
+            Q-values, shaped (S, A).
+        policy : np.ndarray, optional
+            One action per state shaped (S,), or action probabilities
+            shaped (S, A).
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            If an array does not match the environment's layout.
+        """
+        if isinstance(source, RLAlgorithm):
+            source = source.get_solution()
+        if source is not None:
+            values = source['values'] if values is None else values
+            q_values = source['q_values'] if q_values is None else q_values
+            policy = source['policy'] if policy is None else policy
+
+        n_states, n_actions = self.env.n_states, len(self.env.actions)
+        for name, array, shapes in [('values', values, [(n_states,)]),
+                                    ('q_values', q_values, [(n_states, n_actions)]),
+                                    ('policy', policy, [(n_states,), (n_states, n_actions)])]:
+            if array is not None and np.shape(array) not in shapes:
+                raise ValueError(f"{name} shaped {np.shape(array)} does not fit a layout of "
+                                 f"{n_states} states and {n_actions} actions")
+
+        # Assign in place: the arrays may live in shared memory
+        if values is not None:
+            self.values[...] = values
+        if q_values is not None:
+            self.q_values[...] = q_values
+        if policy is not None:
+            if np.ndim(policy) == 1:
+                self.set_deterministic_policy(np.array(policy, dtype=np.int8))
+            else:
+                self.policy = np.array(policy, dtype=self.dtype)
+
+    def update(self, event_type: str, data: dict = None) -> None:
+        """
+        Handle an event of the environment.
+
+        Parameters
+        ----------
+        event_type : str
+            The type of the event; ``'model_changed'`` is handled.
+        data : dict, optional
+            Additional data associated with the event (default is None).
+
+        Returns
+        -------
+        None
+        """
+        if event_type == 'model_changed':
+            self.model_changed(np.asarray(data['states']))
+
+    def model_changed(self, states: np.ndarray) -> None:
+        """
+        React to a change of the environment's rewards, walls, terminal states or transitions.
+
+        The current solution is kept, so the next solve restarts from it.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The states whose reward, kind or transitions changed.
+
+        Returns
+        -------
+        None
+        """
+        pass
+
+    @property
+    def policy(self) -> np.ndarray:
+        """
+        Get the policy as action probabilities for each state-action pair.
+
+        Deterministic policies are expanded from `policy_actions` on first
+        access and cached until the policy changes.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (n_states, n_actions).
+        """
+        if self.policy_actions is None:
+            return self._policy_probs
+        if self._policy_cache_version != self.policy_version:
+            self._policy_probs = self.expand_policy_actions(self.policy_actions)
+            self._policy_probs.flags.writeable = False
+            self._policy_cache_version = self.policy_version
+        return self._policy_probs
+
+    @policy.setter
+    def policy(self, probs: np.ndarray) -> None:
+        """
+        Set a (possibly stochastic) policy from action probabilities.
+
+        The probabilities are copied into a read-only array, so the policy
+        can only change through this setter, which invalidates
+        `policy_sampler`.
+
+        Parameters
+        ----------
+        probs : np.ndarray
+            Array of shape (n_states, n_actions).
+        """
+        self._policy_probs = np.array(probs, dtype=self.dtype)
+        self._policy_probs.flags.writeable = False
+        self.policy_actions = None
+        self._policy_cache_version = None
+        self.policy_version = getattr(self, 'policy_version', -1) + 1
+
+    @property
+    def policy_sampler(self) -> PolicySampler:
+        """
+        Get the action sampling table of the current policy.
+
+        Built on first access and cached until the policy changes.
+
+        Returns
+        -------
+        PolicySampler
+            Sampler of the current policy.
+        """
+        sampler = getattr(self, '_policy_sampler', None)
+        if sampler is None or self._sampler_version != self.policy_version:
+            if self.is_deterministic:
+                sampler = PolicySampler(actions=self.policy_actions, n_actions=len(self.env.actions))
+            else:
+                sampler = PolicySampler(self.policy)
+            self._policy_sampler = sampler
+            self._sampler_version = self.policy_version
+        return sampler
+
+    @property
+    def update_mask(self) -> np.ndarray:
+        """
+        Boolean mask of the states the algorithm updates.
+
+        Terminal and wall states keep their values and have no actions to
+        learn.
+
+        Returns
+        -------
+        np.ndarray
+            True for every non-terminal, non-wall state.
+        """
+        return ~(self.env.terminal_mask | self.env.wall_mask)
+
+    @property
+    def is_deterministic(self) -> bool:
+        """
+        Whether the policy is stored in the compact action-per-state form.
+
+        Returns
+        -------
+        bool
+            True if `policy_actions` holds the policy.
+        """
+        return self.policy_actions is not None
+
+    def set_deterministic_policy(self, actions: np.ndarray) -> None:
+        """
+        Set a deterministic policy from one action per state.
+
+        Parameters
+        ----------
+        actions : np.ndarray
+            Action index for each state, or -1 to act uniformly at random.
+
+        Returns
+        -------
+        None
+        """
+        self.policy_actions = np.asarray(actions, dtype=np.int8)
+        self._policy_probs = None
+        self._policy_cache_version = None
+        self.policy_version = getattr(self, 'policy_version', -1) + 1
+
+    def expand_policy_actions(self, actions: np.ndarray) -> np.ndarray:
+        """
+        Expand action-per-state indices into action probabilities.
+
+        Parameters
+        ----------
+        actions : np.ndarray
+            Action index for each state, or -1 to act uniformly at random.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (n_states, n_actions) with one-hot rows, and
+            uniform rows where the action is -1.
+        """
+        n_actions = len(self.env.actions)
+        probs = np.zeros((len(actions), n_actions), dtype=self.dtype)
+        decided = actions >= 0
+        probs[decided, actions[decided]] = 1.0
+        probs[~decided] = 1.0 / n_actions
+        return probs
+
+    def policy_weighted_sum(self, q_values: np.ndarray, states: np.ndarray = None) -> np.ndarray:
+        """
+        Compute the expected Q-value of states under the current policy.
+
+        Parameters
+        ----------
+        q_values : np.ndarray
+            Array of shape (len(states), n_actions).
+        states : np.ndarray, optional
+            The states the Q-values belong to (default is all states).
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (len(states),).
+        """
+        if states is None:
+            states = slice(None)
+        if self.policy_actions is None:
+            return self._weighted_sum(self._policy_probs[states], q_values)
+
+        actions = self.policy_actions[states]
+        values = q_values[np.arange(len(actions)), np.maximum(actions, 0)]
+        undecided = actions < 0
+        if undecided.any():
+            uniform = np.full((1, q_values.shape[1]), 1.0 / q_values.shape[1], dtype=q_values.dtype)
+            values[undecided] = self._weighted_sum(uniform, q_values[undecided])
+        return values
+
+    @staticmethod
+    def _weighted_sum(probs: np.ndarray, q_values: np.ndarray) -> np.ndarray:
+        """
+        Sum Q-values weighted by action probabilities, action by action.
+
+        Parameters
+        ----------
+        probs : np.ndarray
+            Action probabilities, broadcastable to `q_values`.
+        q_values : np.ndarray
+            Array of shape (n_states, n_actions).
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (n_states,).
+        """
+        values = np.zeros(q_values.shape[0], dtype=q_values.dtype)
+        for a in range(q_values.shape[1]):
+            values += probs[:, a] * q_values[:, a]
+        return values
+
+    def precision_floor(self) -> float:
+        """
+        Smallest value change resolvable at the algorithm's precision.
+
+        Sweeps in reduced precision can keep changing values by a few units
+        in the last place instead of settling, so a `delta` below this floor
+        is round-off rather than progress.
+
+        Returns
+        -------
+        float
+            A few machine epsilons of `dtype`, scaled by the largest value.
+        """
+        scale = max(1.0, float(np.max(np.abs(self.values), initial=0.0)))
+        return 4 * float(np.finfo(self.dtype).eps) * scale
+
+    def has_converged(self, delta: float, theta: float = 1e-6) -> bool:
+        """
+        Check whether a value change means convergence at the algorithm's precision.
+
+        Parameters
+        ----------
+        delta : float
+            Maximum value change of the last evaluation step.
+        theta : float, optional
+            Convergence threshold (default is 1e-6). Thresholds below
+            `precision_floor` are raised to it.
+
+        Returns
+        -------
+        bool
+            True if `delta` is below the effective threshold.
+        """
+        return delta < max(theta, self.precision_floor())
 
     def set_seed(self, seed: int) -> None:
         """
@@ -156,7 +503,23 @@ class RLAlgorithm(ABC):
         int
             Selected action index.
         """
-        return self.rng.choice(self.env.actions, p=self.policy[state])
+        return self.policy_sampler.sample_one(state, self.rng)
+
+    def sample_policy_actions(self, states: np.ndarray) -> np.ndarray:
+        """
+        Sample an action from the current policy in each of many states.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            State indices.
+
+        Returns
+        -------
+        np.ndarray
+            One action per state.
+        """
+        return self.policy_sampler.sample(states, self.rng)
 
     def select_greedy_action(self, state: int) -> int:
         """
@@ -172,8 +535,108 @@ class RLAlgorithm(ABC):
         int
             Action with the highest probability.
         """
+        if self.policy_actions is not None and self.policy_actions[state] >= 0:
+            return int(self.policy_actions[state])
         return np.argmax(self.policy[state])
 
+    def evaluate_policy(self, n_episodes: int = 1000, start_states=None, max_episode_steps: int = None,
+                        batch_size: int = 10000, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95),
+                        seed: int = 42) -> dict:
+        """
+        Estimate the returns of the current policy by running many episodes.
+
+        Episodes run in batches of `batch_size` agents of a `VectorGridWorld`,
+        one episode per agent: actions come from `policy_sampler`, and agents
+        stop moving once they reach a terminal state or `max_episode_steps`.
+        Returns are discounted with `gamma`, so their mean estimates the
+        value of the start states. The random numbers come from a generator
+        of their own, so evaluating leaves `rng` untouched.
+
+        Parameters
+        ----------
+        n_episodes : int, optional
+            Number of episodes (default is 1000).
+        start_states : int or array_like of int, optional
+            Start state of the episodes, cycled through if there are several
+            (default is `env.initial_state`).
+        max_episode_steps : int, optional
+            Episodes are cut after this many steps (default is 4 times the
+            number of states).
+        batch_size : int, optional
+            Number of episodes run at once (default is 10000).
+        quantiles : tuple of float, optional
+            Quantiles of the returns and lengths to report (default is
+            (0.05, 0.25, 0.5, 0.75, 0.95)).
+        seed : int, optional
+            Random seed of the episodes (default is 42).
+
+        Returns
+        -------
+        dict
+            ``'episodes'``, ``'mean_return'``, ``'std_return'`` (sample
+            standard deviation, NaN for a single episode), ``'return_ci'``
+            (95% normal confidence interval of the mean),
+            ``'return_quantiles'``, ``'mean_length'``, ``'length_quantiles'``,
+            ``'success_rate'`` (share of episodes reaching a terminal state),
+            ``'expected_return'`` (mean of `values` over the start states),
+            ``'seconds'`` and ``'seconds_per_episode'``.
+
+        Raises
+        ------
+        ValueError
+            If `n_episodes` is less than 1 or a start state is a wall.
+        """
+        if n_episodes < 1:
+            raise ValueError(f"n_episodes must be at least 1, got {n_episodes}")
+        env = self.env
+        start_time = time.perf_counter()
+        if start_states is None:
+            start_states = env.initial_state
+        start_states = np.atleast_1d(np.asarray(start_states, dtype=np.int64))
+        if env.wall_mask[start_states].any():
+            raise ValueError("Episodes cannot start in a wall")
+        max_episode_steps = max_episode_steps or 4 * env.n_states
+        episode_starts = np.resize(start_states, n_episodes)
+        sampler = self.policy_sampler
+        rng = np.random.RandomState(seed)
+
+        returns = np.zeros(n_episodes)
+        lengths = np.zeros(n_episodes, dtype=np.int64)
+        successes = env.terminal_mask[episode_starts].copy()
+        for first in range(0, n_episodes, batch_size):
+            episodes = np.arange(first, min(first + batch_size, n_episodes))
+            vector = VectorGridWorld(env, len(episodes), seed=rng.randint(2 ** 31),
+                                     start_state=episode_starts[episodes],
+                                     max_episode_steps=max_episode_steps)
+            agents = np.flatnonzero(~successes[episodes])
+            discount = 1.0
+            while len(agents):
+                actions = sampler.sample(vector.agent_states[agents], vector.rng)
+                _, rewards, dones, truncated = vector.step(actions, agents)
+                returns[episodes[agents]] += discount * rewards
+                lengths[episodes[agents]] += 1
+                discount *= self.gamma
+                successes[episodes[agents[dones]]] = True
+                agents = agents[~(dones | truncated)]
+
+        seconds = time.perf_counter() - start_time
+        mean_return = float(returns.mean())
+        std_return = float(returns.std(ddof=1)) if n_episodes > 1 else np.nan
+        half_width = 1.96 * std_return / float(np.sqrt(n_episodes)) if n_episodes > 1 else np.inf
+        return {
+            'episodes': n_episodes,
+            'mean_return': mean_return,
+            'std_return': std_return,
+            'return_ci': (mean_return - half_width, mean_return + half_width),
+            'return_quantiles': dict(zip(quantiles, np.quantile(returns, quantiles).tolist())),
+            'mean_length': float(lengths.mean()),
+            'length_quantiles': dict(zip(quantiles, np.quantile(lengths, quantiles).tolist())),
+            'success_rate': float(successes.mean()),
+            'expected_return': float(self.values[episode_starts].mean()),
+            'seconds': seconds,
+            'seconds_per_episode': seconds / n_episodes,
+        }
+
 
 class GeneralizedPolicyIteration(RLAlgorithm):
     """
@@ -181,8 +644,270 @@ class GeneralizedPolicyIteration(RLAlgorithm):
 
     This class provides the structure for algorithms that alternate between
     policy evaluation and policy improvement steps.
+
+    Attributes
+    ----------
+    backend : str
+        How Bellman backups are computed: ``'table'`` reads the environment's
+        successor table, ``'stencil'`` applies the matrix-free
+        `StencilBellmanOperator` and needs no transition model.
+    bellman : TabularBellmanOperator or StencilBellmanOperator
+        The operator computing batched Q-values for the selected backend.
+    in_place : bool
+        Whether evaluation sweeps update values in place (Gauss-Seidel)
+        instead of synchronously from a copy (Jacobi).
+    sweep_order : str
+        State ordering of in-place sweeps: ``'row_major'``, ``'reverse'``
+        or ``'distance'`` (nearest to a terminal state first).
+    n_workers : int or None
+        Number of worker processes running synchronous sweeps, None to
+        sweep in the main process.
     """
 
+    BACKENDS = ('table', 'stencil')
+    SWEEP_ORDERS = ('row_major', 'reverse', 'distance')
+
+    def __init__(self, env: GridWorld, gamma: float = 0.9, seed: int = 42, backend: str = 'table',
+                 in_place: bool = False, sweep_order: str = 'row_major', n_workers: int = None):
+        """
+        Initialize the Generalized Policy Iteration algorithm.
+
+        Parameters
+        ----------
+        env : GridWorld
+            The environment to interact with.
+        gamma : float, optional
+            Discount factor for future rewards (default is 0.9).
+        seed : int, optional
+            Random seed for reproducibility (default is 42).
+        backend : str, optional
+            Bellman backup backend, ``'table'`` or ``'stencil'`` (default is ``'table'``).
+        in_place : bool, optional
+            Whether to use in-place Gauss-Seidel sweeps (default is False).
+        sweep_order : str, optional
+            State ordering of in-place sweeps (default is ``'row_major'``).
+        n_workers : int, optional
+            Number of worker processes for synchronous sweeps (default is
+            None, sweep in the main process). See `SharedMemorySweepEngine`.
+
+        Raises
+        ------
+        ValueError
+            If the backend or sweep order is unknown, the table backend is
+            selected for an environment built without a transition model, or
+            worker processes are combined with in-place sweeps.
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+        if sweep_order not in self.SWEEP_ORDERS:
+            raise ValueError(f"Unknown sweep order '{sweep_order}', expected one of {self.SWEEP_ORDERS}")
+        if n_workers is not None and in_place:
+            raise ValueError("In-place sweeps are sequential and cannot use worker processes")
+        self.backend = backend
+        self.in_place = in_place
+        self.sweep_order = sweep_order
+        self.n_workers = n_workers
+        self._sweep_blocks = None
+        self._engine = None
+        if backend == 'stencil':
+            self.bellman = StencilBellmanOperator(env)
+        else:
+            self.bellman = TabularBellmanOperator(env)
+        super().__init__(env, gamma, seed)
+        if n_workers is not None:
+            self._engine = SharedMemorySweepEngine(self, n_workers)
+
+    def reset(self) -> None:
+        """
+        Reset the algorithm's internal state and the cached sweep blocks.
+
+        Returns
+        -------
+        None
+        """
+        super().reset()
+        self._sweep_blocks = None
+        if self._engine is not None:
+            self._engine.attach()
+
+    def warm_start(self, source=None, values: np.ndarray = None, q_values: np.ndarray = None,
+                   policy: np.ndarray = None) -> None:
+        """
+        Seed the values, Q-values and policy from a prior solution.
+
+        See `RLAlgorithm.warm_start`. Terminal and wall states are never
+        backed up, so they are reset to zero whatever the prior solution
+        held for them; this keeps a solution valid after walls or terminal
+        states moved.
+
+        Parameters
+        ----------
+        source : RLAlgorithm or dict, optional
+            Another algorithm on an environment with the same layout, or a
+            solution returned by `get_solution`.
+        values : np.ndarray, optional
+            State values, shaped (S,).
+        q_values : np.ndarray, optional
+            Q-values, shaped (S, A).
+        policy : np.ndarray, optional
+            One action per state shaped (S,), or action probabilities
+            shaped (S, A).
+
+        Returns
+        -------
+        None
+        """
+        super().warm_start(source, values, q_values, policy)
+        fixed = ~self.update_mask
+        self.values[fixed] = 0.0
+        self.q_values[fixed] = 0.0
+
+    def model_changed(self, states: np.ndarray) -> None:
+        """
+        Invalidate what depends on the changed states and keep the rest.
+
+        Cached sweep blocks and stencil masks are rebuilt, worker processes
+        are restarted, and states that became terminal or walls are reset to
+        zero. The values of the other states are kept, so the next sweeps
+        re-solve from the previous solution. Those sweeps still cover the
+        whole grid; only `PrioritizedSweeping` limits its backups to the
+        region around the changed states.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The states whose reward, kind or transitions changed.
+
+        Returns
+        -------
+        None
+        """
+        self._sweep_blocks = None
+        if self.backend == 'stencil':
+            self.bellman = StencilBellmanOperator(self.env)
+        if self._engine is not None:
+            self._engine.restart()
+        fixed = states[~self.update_mask[states]]
+        self.values[fixed] = 0.0
+        self.q_values[fixed] = 0.0
+
+    def close(self) -> None:
+        """
+        Stop the sweep worker processes, if any, and release their shared memory.
+
+        Returns
+        -------
+        None
+        """
+        if self._engine is not None:
+            self._engine.close()
+            self._engine = None
+
+    def state_values(self, q_values: np.ndarray, states: np.ndarray = None) -> np.ndarray:
+        """
+        Reduce backed-up Q-values to state values.
+
+        Parameters
+        ----------
+        q_values : np.ndarray
+            Q-values of `states`, shaped (len(states), n_actions).
+        states : np.ndarray, optional
+            The states the Q-values belong to (default is all states).
+
+        Returns
+        -------
+        np.ndarray
+            The new value of each state.
+
+        Raises
+        ------
+        NotImplementedError
+            If the subclass does not implement this method.
+        """
+        raise NotImplementedError
+
+    def sweep(self) -> float:
+        """
+        Back up every non-terminal, non-wall state once.
+
+        Synchronous sweeps compute all Q-values from a copy of the values.
+        In-place sweeps visit the states block by block in `sweep_order`,
+        and each block reads the values already updated by earlier blocks.
+        The blocks are wavefronts whose states are never neighbors of each
+        other, so the result equals a state-by-state Gauss-Seidel sweep in
+        that order. With `n_workers`, synchronous sweeps run on the
+        `SharedMemorySweepEngine` instead.
+
+        Returns
+        -------
+        float
+            Maximum value change (`delta`) during the sweep.
+        """
+        if self._engine is not None:
+            return self._engine.sweep()
+
+        if not self.in_place:
+            old_values = self.values.copy()
+            mask = self.update_mask
+
+            # Q-values of every state-action pair in one batched backup
+            q_values = self.bellman.q_values(old_values, self.gamma)
+            values = self.state_values(q_values)
+
+            # Terminal and wall states keep their values
+            self.q_values[mask] = q_values[mask]
+            self.values[mask] = values[mask]
+
+            # Track maximum value change
+            return np.max(np.abs(old_values - self.values), initial=0.0)
+
+        delta = 0.0
+        for block in self.sweep_blocks():
+            q_values = self.bellman.q_values_for(block, self.values, self.gamma)
+            values = self.state_values(q_values, block)
+            delta = max(delta, np.max(np.abs(values - self.values[block]), initial=0.0))
+            self.q_values[block] = q_values
+            self.values[block] = values
+        return delta
+
+    def sweep_blocks(self) -> list:
+        """
+        Get the blocks of states visited by in-place sweeps.
+
+        ``'row_major'`` and ``'reverse'`` visit the anti-diagonals of the grid
+        forwards or backwards, which is equivalent to a row-major (or reversed)
+        state-by-state sweep. ``'distance'`` visits states in increasing
+        distance from the terminal states. Terminal and wall states are left
+        out. The blocks are cached until `reset` is called.
+
+        Returns
+        -------
+        list of np.ndarray
+            State indices of each block, in visiting order.
+        """
+        if self._sweep_blocks is not None:
+            return self._sweep_blocks
+
+        env = self.env
+        states = np.arange(env.n_states)
+        if self.sweep_order == 'distance':
+            level = env.distance_to_terminal()
+            # Unreachable states are split in a checkerboard so no block holds neighbors
+            unreachable = level < 0
+            level[unreachable] = level.max() + 1 + (states[unreachable] // env.size
+                                                    + states[unreachable] % env.size) % 2
+        else:
+            level = states // env.size + states % env.size
+            if self.sweep_order == 'reverse':
+                level = level.max() - level
+
+        keep = self.update_mask
+        order = np.argsort(level[keep], kind='stable')
+        ordered, levels = states[keep][order], level[keep][order]
+        splits = np.flatnonzero(np.diff(levels)) + 1
+        self._sweep_blocks = np.split(ordered, splits)
+        return self._sweep_blocks
+
     def policy_evaluation_step(self, theta: float = 1e-6) -> float:
         """
         Single step of policy evaluation.
@@ -220,37 +945,59 @@ class GeneralizedPolicyIteration(RLAlgorithm):
         """
         raise NotImplementedError
 
-    def greedy_policy_improvement(self) -> bool:
+    def greedy_policy_improvement(self, tolerance: float = None) -> bool:
         """
         Improve the policy greedily based on current Q-values.
 
-        This method sets the action probability to 1 for the action with the
-        highest Q-value and 0 for others. It checks if the new policy is the
-        same as the old one.
+        This method picks the action with the highest Q-value for every
+        non-terminal state in one vectorized argmax and stores the result as
+        a compact deterministic policy. Convergence is checked by comparing
+        the whole policy with the previous one. Terminal states keep their
+        previous action probabilities; the dense form is only kept if those
+        rows cannot be expressed compactly.
+
+        Parameters
+        ----------
+        tolerance : float, optional
+            If given, a deterministic policy keeps its current action unless
+            another action is better by more than `tolerance`. This stops
+            round-off noise from flipping ties between equally good actions
+            (default is None, a plain argmax in double precision and
+            `precision_floor` in lower precision).
 
         Returns
         -------
         bool
             True if the policy has converged, False otherwise.
         """
-        is_policy_converged = True
-        for s in range(self.env.n_states):
-            if s in self.env.terminal_states:
-                continue
-
-            old_policy = self.policy[s].copy()
-
-            # Reset policy probabilities
-            self.policy[s] = np.zeros(len(self.env.actions))
+        improved = ~self.env.terminal_mask
+        best_actions = np.argmax(self.q_values, axis=1).astype(np.int8)
+        if tolerance is None and self.dtype != np.float64:
+            tolerance = self.precision_floor()
+        if tolerance is not None and self.policy_actions is not None:
+            current = self.policy_actions
+            current_q = self.q_values[np.arange(len(current)), np.maximum(current, 0)]
+            keep = (current >= 0) & (current_q >= self.q_values.max(axis=1) - tolerance)
+            best_actions = np.where(keep, current, best_actions)
 
-            # Select best action
-            best_action = np.argmax(self.q_values[s])
-            self.policy[s, best_action] = 1
+        if self.policy_actions is not None:
+            new_actions = np.where(improved, best_actions, self.policy_actions)
+            is_policy_converged = np.array_equal(new_actions, self.policy_actions)
+            if not is_policy_converged:
+                self.set_deterministic_policy(new_actions)
+            return is_policy_converged
 
-            # Check if policy changed
-            if not np.array_equal(old_policy, self.policy[s]):
-                is_policy_converged = False
+        old_policy = self.policy
+        new_policy = old_policy.copy()
+        new_policy[improved] = self.expand_policy_actions(best_actions[improved])
+        is_policy_converged = np.array_equal(old_policy, new_policy)
 
+        # Rows left untouched stay compact only if they are uniform
+        kept = old_policy[~improved]
+        if np.all(kept == 1.0 / len(self.env.actions)):
+            self.set_deterministic_policy(np.where(improved, best_actions, -1))
+        elif not is_policy_converged:
+            self.policy = new_policy
         return is_policy_converged
 
     def step(self) -> bool:
@@ -288,4 +1035,274 @@ class GeneralizedPolicyIteration(RLAlgorithm):
         for _ in range(max_steps):
             is_converged = self.step()
             if is_converged:
-                break
\ No newline at end of file
+                break
+
+
+class TemporalDifferenceLearning(RLAlgorithm):
+    """
+    Base class for model-free temporal-difference control algorithms.
+
+    Experience is generated by simulating the environment's dynamics from
+    `env.move_table`, without the transition model. A batch of `n_envs`
+    episodes advances in lockstep: actions are picked for the whole batch
+    with one vectorized epsilon-greedy selection, and the Q-values are
+    updated in place with one scattered update per step. Finished episodes
+    are replaced by new ones until the requested number of episodes ran.
+
+    Attributes
+    ----------
+    alpha : float
+        Learning rate.
+    epsilon : float
+        Probability of a uniformly random exploratory action.
+    n_envs : int
+        Number of episodes simulated in lockstep.
+    max_episode_steps : int
+        Episodes are cut after this many steps.
+    total_episodes : int
+        Number of episodes run since the last reset.
+    total_steps : int
+        Number of transitions experienced since the last reset.
+    episodes_per_second : float
+        Throughput of the last `run_episodes` call.
+    last_mean_return : float
+        Mean discounted return of the episodes of the last call.
+    """
+
+    def __init__(self, env: GridWorld, gamma: float = 0.9, seed: int = 42, alpha: float = 0.1,
+                 epsilon: float = 0.1, n_envs: int = 64, max_episode_steps: int = None):
+        """
+        Initialize the temporal-difference algorithm.
+
+        Parameters
+        ----------
+        env : GridWorld
+            The environment to interact with.
+        gamma : float, optional
+            Discount factor for future rewards (default is 0.9).
+        seed : int, optional
+            Random seed for reproducibility (default is 42).
+        alpha : float, optional
+            Learning rate (default is 0.1).
+        epsilon : float, optional
+            Exploration probability (default is 0.1).
+        n_envs : int, optional
+            Number of episodes simulated in lockstep (default is 64).
+        max_episode_steps : int, optional
+            Episode length limit (default is 4 times the number of states).
+        """
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.n_envs = n_envs
+        self.max_episode_steps = max_episode_steps or 4 * env.n_states
+        super().__init__(env, gamma, seed)
+
+    def reset(self) -> None:
+        """
+        Reset the Q-values, the policy and the experience counters.
+
+        Returns
+        -------
+        None
+        """
+        super().reset()
+        self.total_episodes = 0
+        self.total_steps = 0
+        self.episodes_per_second = 0.0
+        self.last_mean_return = 0.0
+
+    def epsilon_greedy(self, states: np.ndarray) -> np.ndarray:
+        """
+        Pick an epsilon-greedy action in each state.
+
+        Ties between greedy actions are broken uniformly at random.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The states of the batch.
+
+        Returns
+        -------
+        np.ndarray
+            One action per state.
+        """
+        q_values = self.q_values[states]
+        best = q_values == q_values.max(axis=1, keepdims=True)
+        actions = np.argmax(best * self.rng.rand(*best.shape), axis=1)
+        explore = self.rng.rand(len(states)) < self.epsilon
+        actions[explore] = self.rng.randint(len(self.env.actions), size=int(explore.sum()))
+        return actions
+
+    def sample_transitions(self, states: np.ndarray, actions: np.ndarray) -> np.ndarray:
+        """
+        Sample the next state of each (state, action) pair.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The states of the batch.
+        actions : np.ndarray
+            The actions taken.
+
+        Returns
+        -------
+        np.ndarray
+            The next states, drawn with `GridWorld.sample_next_states`.
+        """
+        return self.env.sample_next_states(states, actions, self.rng).astype(np.int64)
+
+    def td_update(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+                  next_states: np.ndarray, next_actions: np.ndarray, done: np.ndarray) -> None:
+        """
+        Update the Q-values in place from a batch of transitions.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The states of the batch.
+        actions : np.ndarray
+            The actions taken.
+        rewards : np.ndarray
+            The rewards received.
+        next_states : np.ndarray
+            The next states.
+        next_actions : np.ndarray
+            The actions the behaviour policy takes in the next states.
+        done : np.ndarray
+            Whether each next state is terminal.
+
+        Raises
+        ------
+        NotImplementedError
+            If the subclass does not implement this method.
+        """
+        raise NotImplementedError
+
+    def apply_td_targets(self, states: np.ndarray, actions: np.ndarray, targets: np.ndarray) -> None:
+        """
+        Move the Q-values of a batch of (state, action) pairs towards their targets.
+
+        Pairs visited by several episodes of the batch get one step of size
+        `alpha` along their mean TD error, not one step per visit: the
+        visits share the same old Q-value, and summing their steps would
+        scale the learning rate by the number of visits.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The states of the batch.
+        actions : np.ndarray
+            The actions taken.
+        targets : np.ndarray
+            The TD target of each transition.
+
+        Returns
+        -------
+        None
+        """
+        errors = targets - self.q_values[states, actions]
+        pairs, inverse = np.unique(states * len(self.env.actions) + actions, return_inverse=True)
+        mean_errors = np.bincount(inverse, weights=errors) / np.bincount(inverse)
+        self.q_values.reshape(-1)[pairs] += (self.alpha * mean_errors).astype(self.dtype)
+
+    def run_episodes(self, n_episodes: int, buffer=None) -> dict:
+        """
+        Run episodes from the initial state and learn from them.
+
+        Parameters
+        ----------
+        n_episodes : int
+            Number of episodes to run.
+        buffer : ReplayBuffer, optional
+            Replay buffer that stores every experienced transition.
+
+        Returns
+        -------
+        dict
+            ``'episodes'``, ``'steps'``, ``'seconds'``, ``'episodes_per_second'``
+            and ``'mean_return'`` (mean discounted return) of this call.
+        """
+        env = self.env
+        start_time = time.perf_counter()
+        n_running = min(self.n_envs, n_episodes)
+        states = np.full(n_running, env.initial_state, dtype=np.int64)
+        actions = self.epsilon_greedy(states)
+        returns = np.zeros(n_running)
+        discounts = np.ones(n_running)
+        lengths = np.zeros(n_running, dtype=np.int64)
+        started, steps, return_sum = n_running, 0, 0.0
+
+        while len(states):
+            next_states = self.sample_transitions(states, actions)
+            rewards = env.rewards[next_states]
+            done = env.terminal_mask[next_states]
+            next_actions = self.epsilon_greedy(next_states)
+            self.td_update(states, actions, rewards, next_states, next_actions, done)
+            if buffer is not None:
+                buffer.extend(states, actions, rewards, next_states, done)
+
+            returns += discounts * rewards
+            discounts *= self.gamma
+            lengths += 1
+            steps += len(states)
+            states, actions = next_states, next_actions
+
+            ended = np.flatnonzero(done | (lengths >= self.max_episode_steps))
+            if len(ended) == 0:
+                continue
+            return_sum += returns[ended].sum()
+
+            # Restart as many ended slots as episodes remain, drop the others
+            restarted = ended[:max(0, min(len(ended), n_episodes - started))]
+            started += len(restarted)
+            states[restarted] = env.initial_state
+            actions[restarted] = self.epsilon_greedy(states[restarted])
+            returns[restarted], discounts[restarted], lengths[restarted] = 0.0, 1.0, 0
+            keep = np.ones(len(states), dtype=bool)
+            keep[ended[len(restarted):]] = False
+            states, actions, returns, discounts, lengths = (
+                states[keep], actions[keep], returns[keep], discounts[keep], lengths[keep])
+
+        self.update_greedy_solution()
+        seconds = time.perf_counter() - start_time
+        self.total_episodes += n_episodes
+        self.total_steps += steps
+        self.episodes_per_second = n_episodes / seconds if seconds > 0 else float('inf')
+        self.last_mean_return = float(return_sum / n_episodes) if n_episodes else 0.0
+        return {
+            'episodes': n_episodes,
+            'steps': steps,
+            'seconds': seconds,
+            'episodes_per_second': self.episodes_per_second,
+            'mean_return': self.last_mean_return,
+        }
+
+    def update_greedy_solution(self) -> None:
+        """
+        Derive the state values and the greedy policy from the Q-values.
+
+        Returns
+        -------
+        None
+        """
+        mask = self.update_mask
+        self.values[mask] = np.max(self.q_values[mask], axis=1)
+        actions = np.argmax(self.q_values, axis=1)
+        self.set_deterministic_policy(np.where(mask, actions, -1))
+
+    def select_action(self, state: int) -> int:
+        """
+        Select the greedy action of the learned policy.
+
+        Parameters
+        ----------
+        state : int
+            The current state index.
+
+        Returns
+        -------
+        int
+            The index of the selected action.
+        """
+        return self.select_greedy_action(state)
@@ -0,0 +1,323 @@
+import numpy as np
+from rl_algorithms.core.rl_env.grid_world import GridWorld
+from rl_algorithms.core.algorithms.base import RLAlgorithm
+from rl_algorithms.core.algorithms.bellman import TabularBellmanOperator, StencilBellmanOperator
+
+
+class BatchValueIteration:
+    """
+    Value iteration for many discount factors and reward variants at once.
+
+    A batch of B problems sharing the dynamics of one `GridWorld` is solved
+    together: the values are held as a (B, S) array, and every sweep backs
+    up all unfinished members in one vectorized Bellman optimality backup.
+    Each member has its own discount factor and, optionally, its own reward
+    vector. Members whose `delta` dropped below `theta` are frozen and no
+    longer take part in the sweeps.
+
+    The solver observes its environment: when the map changes, the
+    Bellman operator is rebuilt and every member resumes sweeping from its
+    current values.
+
+    Attributes
+    ----------
+    env : GridWorld
+        The environment whose dynamics are shared by the batch.
+    gammas : np.ndarray
+        Discount factor of each member, shaped (B,).
+    rewards : np.ndarray
+        State rewards, shaped (S,) if shared or (B, S) per member.
+    theta : float
+        Convergence threshold of each member.
+    backend : str
+        Bellman backup backend, ``'table'`` or ``'stencil'``.
+    bellman : TabularBellmanOperator or StencilBellmanOperator
+        The operator computing batched Q-values.
+    values : np.ndarray
+        Value function of each member, shaped (B, S).
+    deltas : np.ndarray
+        Maximum value change of each member in its last sweep, shaped (B,).
+    sweeps : np.ndarray
+        Number of sweeps performed by each member, shaped (B,).
+    converged : np.ndarray
+        Whether each member has converged, shaped (B,).
+    chunk_size : int or None
+        Largest number of members backed up together, None for all.
+    """
+
+    def __init__(self, env: GridWorld, gammas, rewards: np.ndarray = None,
+                 theta: float = 1e-6, backend: str = 'table', chunk_size: int = None):
+        """
+        Initialize the batch solver.
+
+        Parameters
+        ----------
+        env : GridWorld
+            The environment whose dynamics are shared by the batch.
+        gammas : float or array_like
+            Discount factor of each member. A scalar is broadcast over the
+            reward vectors.
+        rewards : np.ndarray, optional
+            Reward vectors shaped (B, S), or (S,) to share one reward vector
+            (default is `env.rewards`).
+        theta : float, optional
+            Convergence threshold of each member (default is 1e-6).
+        backend : str, optional
+            Bellman backup backend, ``'table'`` or ``'stencil'`` (default is ``'table'``).
+        chunk_size : int, optional
+            Largest number of members backed up together (default is None,
+            all of them). The Q-values of a chunk take chunk_size * S * A
+            floats, so large batches should be chunked.
+
+        Raises
+        ------
+        ValueError
+            If the shapes of `gammas` and `rewards` do not match, or the
+            backend is unknown.
+        """
+        rewards = env.rewards if rewards is None else np.asarray(rewards, dtype=env.dtype)
+        gammas = np.asarray(gammas, dtype=env.dtype)
+        if gammas.ndim == 0:
+            gammas = np.full(len(rewards) if rewards.ndim == 2 else 1, gammas)
+        if rewards.shape[-1] != env.n_states or (rewards.ndim == 2 and len(rewards) != len(gammas)):
+            raise ValueError("rewards must be shaped (S,) or (B, S) with one row per gamma")
+
+        if backend == 'stencil':
+            self.bellman = StencilBellmanOperator(env)
+        elif backend == 'table':
+            self.bellman = TabularBellmanOperator(env)
+        else:
+            raise ValueError(f"Unknown backend '{backend}', expected 'table' or 'stencil'")
+
+        self.env = env
+        self.gammas = gammas
+        self.rewards = rewards
+        self.theta = theta
+        self.backend = backend
+        self.chunk_size = chunk_size
+        self.reset()
+        env.add_observer(self)
+
+    @property
+    def n_members(self) -> int:
+        """
+        Number of problems in the batch.
+
+        Returns
+        -------
+        int
+            The batch size B.
+        """
+        return len(self.gammas)
+
+    # Only needs `env`, so the mask is shared with the other algorithms
+    update_mask = RLAlgorithm.update_mask
+
+    def reset(self) -> None:
+        """
+        Reset every member to zero values.
+
+        Returns
+        -------
+        None
+        """
+        self.values = np.zeros((self.n_members, self.env.n_states), dtype=self.env.dtype)
+        self.deltas = np.full(self.n_members, np.inf)
+        self.sweeps = np.zeros(self.n_members, dtype=np.int64)
+        self.converged = np.zeros(self.n_members, dtype=bool)
+
+    def update(self, event_type: str, data: dict = None) -> None:
+        """
+        Handle an event of the environment.
+
+        Parameters
+        ----------
+        event_type : str
+            The type of the event; ``'model_changed'`` is handled.
+        data : dict, optional
+            Additional data associated with the event (default is None).
+
+        Returns
+        -------
+        None
+        """
+        if event_type == 'model_changed':
+            self.model_changed(np.asarray(data['states']))
+
+    def model_changed(self, states: np.ndarray) -> None:
+        """
+        Invalidate what depends on the changed states and keep the rest.
+
+        The stencil masks are rebuilt, states that stopped being updated
+        are reset to zero, and every member sweeps again until it
+        re-converges from its current values.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The states whose reward, kind or transitions changed.
+
+        Returns
+        -------
+        None
+        """
+        if self.backend == 'stencil':
+            self.bellman = StencilBellmanOperator(self.env)
+        for members in self._chunks(np.arange(self.n_members)):
+            mask = np.broadcast_to(self._member_mask(members), (len(members), self.env.n_states))
+            block = np.ix_(members, states)
+            self.values[block] = np.where(mask[:, states], self.values[block], 0.0)
+        self.deltas[:] = np.inf
+        self.converged[:] = False
+
+    def policy_evaluation_step(self) -> np.ndarray:
+        """
+        Perform one value iteration sweep for every unfinished member.
+
+        Returns
+        -------
+        np.ndarray
+            The latest `delta` of each member, shaped (B,).
+        """
+        for members in self._chunks(np.flatnonzero(~self.converged)):
+            values = self.values[members]
+            q_values = self.bellman.q_values(values, self.gammas[members, None],
+                                             self._member_rewards(members))
+            new_values = np.where(self._member_mask(members), np.max(q_values, axis=-1), values)
+
+            self.deltas[members] = np.max(np.abs(new_values - values), axis=1, initial=0.0)
+            self.values[members] = new_values
+            self.sweeps[members] += 1
+            self.converged[members] = self.deltas[members] < self._thresholds(new_values)
+        return self.deltas
+
+    def run(self, max_sweeps: int = 1000) -> None:
+        """
+        Sweep until every member converges or `max_sweeps` is reached.
+
+        Parameters
+        ----------
+        max_sweeps : int, optional
+            Maximum number of sweeps (default is 1000).
+
+        Returns
+        -------
+        None
+        """
+        for _ in range(max_sweeps):
+            self.policy_evaluation_step()
+            if self.converged.all():
+                break
+
+    def q_values(self, members: np.ndarray = None) -> np.ndarray:
+        """
+        Compute the Q-values of members from their current values.
+
+        Parameters
+        ----------
+        members : np.ndarray, optional
+            Indices of the members (default is all of them).
+
+        Returns
+        -------
+        np.ndarray
+            Q-values shaped (len(members), S, A).
+        """
+        if members is None:
+            members = np.arange(self.n_members)
+        return self.bellman.q_values(self.values[members], self.gammas[members, None],
+                                     self._member_rewards(members))
+
+    def greedy_actions(self, members: np.ndarray = None) -> np.ndarray:
+        """
+        Compute the greedy policy of members from their current values.
+
+        Parameters
+        ----------
+        members : np.ndarray, optional
+            Indices of the members (default is all of them).
+
+        Returns
+        -------
+        np.ndarray
+            Greedy action of each state, shaped (len(members), S).
+        """
+        return np.argmax(self.q_values(members), axis=-1).astype(np.int8)
+
+    def _thresholds(self, values: np.ndarray) -> np.ndarray:
+        """
+        Effective convergence threshold of members at the value precision.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Values of the members, shaped (len(members), S).
+
+        Returns
+        -------
+        np.ndarray
+            `theta`, raised to a few machine epsilons of the value scale
+            where that is larger, shaped (len(members),).
+        """
+        scale = np.maximum(1.0, np.max(np.abs(values), axis=1, initial=0.0))
+        return np.maximum(self.theta, 4 * np.finfo(values.dtype).eps * scale)
+
+    def _chunks(self, members: np.ndarray) -> list:
+        """
+        Split member indices into chunks of at most `chunk_size`.
+
+        Parameters
+        ----------
+        members : np.ndarray
+            Indices of the members.
+
+        Returns
+        -------
+        list of np.ndarray
+            The chunks, empty if there are no members.
+        """
+        size = self.chunk_size or max(len(members), 1)
+        return [members[i:i + size] for i in range(0, len(members), size)]
+
+    def _member_rewards(self, members: np.ndarray) -> np.ndarray:
+        """
+        Select the reward vectors of members.
+
+        Parameters
+        ----------
+        members : np.ndarray
+            Indices of the members.
+
+        Returns
+        -------
+        np.ndarray
+            Rewards broadcastable to (len(members), S).
+        """
+        return self.rewards[members] if self.rewards.ndim == 2 else self.rewards
+
+    def _member_mask(self, members: np.ndarray) -> np.ndarray:
+        """
+        Select the update masks of members.
+
+        Parameters
+        ----------
+        members : np.ndarray
+            Indices of the members.
+
+        Returns
+        -------
+        np.ndarray
+            Masks broadcastable to (len(members), S).
+        """
+        return self.update_mask
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the algorithm.
+
+        Returns
+        -------
+        str
+            The name of the algorithm ("Batch Value Iteration").
+        """
+        return "Batch Value Iteration"
@@ -0,0 +1,346 @@
+import numpy as np
+from rl_algorithms.core.rl_env.grid_world import GridWorld
+
+
+class TabularBellmanOperator:
+    """
+    Bellman backup against the environment's precomputed successor table.
+
+    All Q-values are computed in one batched pass over the (S, A, K)
+    successor table. Successor contributions are accumulated slot by slot,
+    and the table lists each row's successors in `get_possible_successors`
+    order, so the result is bit-for-bit identical to a per-state loop over
+    `get_possible_successors`.
+
+    Parameters
+    ----------
+    env : GridWorld
+        The environment whose transition model is applied.
+
+    Attributes
+    ----------
+    env : GridWorld
+        The environment whose transition model is applied.
+    """
+
+    def __init__(self, env: GridWorld):
+        """
+        Initialize the operator.
+
+        Parameters
+        ----------
+        env : GridWorld
+            The environment whose transition model is applied.
+
+        Raises
+        ------
+        ValueError
+            If the environment was built without a transition model.
+        """
+        if env.successor_states is None:
+            raise ValueError("The table backend needs an environment built with build_model=True")
+        self.env = env
+
+    def q_values(self, values: np.ndarray, gamma: float, rewards: np.ndarray = None) -> np.ndarray:
+        """
+        Apply the Bellman backup to every state and action.
+
+        Leading batch dimensions are supported: values shaped (B, S) with
+        a gamma shaped (B, 1) and rewards shaped (S,) or (B, S) back up B
+        problems at once.
+
+        Parameters
+        ----------
+        values : ndarray of float
+            Current state values, shaped (S,) or (B, S).
+        gamma : float or ndarray of float
+            Discount factor for future rewards, broadcastable to `values`.
+        rewards : ndarray of float, optional
+            State rewards, broadcastable to `values` (default is `env.rewards`).
+
+        Returns
+        -------
+        ndarray of float
+            Q-values shaped (S, A), or (B, S, A) for batched values.
+        """
+        env = self.env
+        if rewards is None:
+            rewards = env.rewards
+        targets = rewards + gamma * values
+        successors, probs = env.successor_states, env.successor_probs
+
+        if targets.ndim == 1:
+            q_values = np.zeros(successors.shape[:2], dtype=targets.dtype)
+            for k in range(successors.shape[2]):
+                q_values += probs[:, :, k] * targets[successors[:, :, k]]
+            return q_values
+
+        # Batched: gather whole batch rows per successor, state-major
+        batch_shape = targets.shape[:-1]
+        targets = np.ascontiguousarray(targets.reshape(-1, env.n_states).T)
+        q_values = np.zeros(successors.shape[:2] + targets.shape[1:], dtype=targets.dtype)
+        gathered = np.empty_like(q_values)
+        for k in range(successors.shape[2]):
+            np.take(targets, successors[:, :, k], axis=0, out=gathered)
+            gathered *= probs[:, :, k, None]
+            q_values += gathered
+        return np.moveaxis(q_values, -1, 0).reshape(batch_shape + successors.shape[:2])
+
+    def q_values_for(self, states: np.ndarray, values: np.ndarray, gamma: float,
+                     rewards: np.ndarray = None) -> np.ndarray:
+        """
+        Apply the Bellman backup to a subset of states.
+
+        Parameters
+        ----------
+        states : ndarray of int
+            The states to back up.
+        values : ndarray of float
+            Current state values, shaped (S,).
+        gamma : float
+            Discount factor for future rewards.
+        rewards : ndarray of float, optional
+            State rewards (default is `env.rewards`).
+
+        Returns
+        -------
+        ndarray of float
+            Q-values shaped (len(states), A).
+        """
+        env = self.env
+        if rewards is None:
+            rewards = env.rewards
+        successors = env.successor_states[states]
+        probs = env.successor_probs[states]
+
+        q_values = np.zeros(successors.shape[:2], dtype=np.result_type(rewards, values))
+        if len(states) == 0:
+            return q_values
+        low, high = successors.min(), successors.max() + 1
+        if high - low <= successors.size:
+            # Compact block of states: compute each successor's target once
+            targets = rewards[low:high] + gamma * values[low:high]
+            for k in range(successors.shape[2]):
+                q_values += probs[:, :, k] * targets[successors[:, :, k] - low]
+            return q_values
+
+        for k in range(successors.shape[2]):
+            s_prime = successors[:, :, k]
+            q_values += probs[:, :, k] * (rewards[s_prime] + gamma * values[s_prime])
+        return q_values
+
+
+class StencilBellmanOperator:
+    """
+    Matrix-free Bellman backup for the GridWorld dynamics.
+
+    The GridWorld dynamics are translation-invariant: every move succeeds
+    with probability `main_transition_prob` and slips to one of the two
+    perpendicular directions otherwise, bouncing back from walls and borders.
+    The backup is therefore applied as shifted-array operations over the 2D
+    value grid, using only wall and border masks. No transition tensor is
+    stored, so the memory stays at O(S).
+
+    Duplicate successors are merged the same way as in
+    `GridWorld.get_possible_successors`, so the operator reproduces the
+    tabular model.
+
+    Parameters
+    ----------
+    env : GridWorld
+        The environment whose dynamics are applied.
+
+    Attributes
+    ----------
+    env : GridWorld
+        The environment whose dynamics are applied.
+    blocked : ndarray of bool
+        Array shaped (4, size, size); True where the move bounces back.
+    slip_masks : ndarray of bool
+        Array shaped (A, 2, size, size); True where each perpendicular slip
+        reaches a state not already counted for the action.
+    """
+
+    def __init__(self, env: GridWorld):
+        """
+        Initialize the operator and precompute the wall and border masks.
+
+        Parameters
+        ----------
+        env : GridWorld
+            The environment whose dynamics are applied.
+        """
+        self.env = env
+        self.blocked = self.build_blocked_masks()
+
+        n_actions = len(env.actions)
+        self.slip_masks = np.empty((n_actions, 2) + self.blocked.shape[1:], dtype=bool)
+        for a in range(n_actions):
+            main = self.blocked[a]
+            perp1 = self.blocked[(a + 1) % 4]
+            perp2 = self.blocked[(a - 1) % 4]
+            # Two moves share a successor only if both bounce back
+            self.slip_masks[a, 0] = ~(perp1 & main)
+            self.slip_masks[a, 1] = ~(perp2 & (main | perp1))
+
+    def build_blocked_masks(self) -> np.ndarray:
+        """
+        Compute where each move bounces back from a wall or border.
+
+        Returns
+        -------
+        ndarray of bool
+            Array shaped (4, size, size).
+        """
+        size = self.env.size
+        walls = self.env.wall_mask.reshape(size, size)
+        blocked = np.ones((4, size, size), dtype=bool)
+        for d in range(4):
+            # A move is free if the target cell is inside the grid and not a wall
+            blocked[d][self._inner(d)] = walls[self._outer(d)]
+        return blocked
+
+    def shift(self, grid: np.ndarray, direction: int) -> np.ndarray:
+        """
+        Read each cell's neighbor in `direction`, bouncing back when blocked.
+
+        Parameters
+        ----------
+        grid : ndarray
+            Array shaped (..., size, size).
+        direction : int
+            The direction of the move (0: up, 1: right, 2: down, 3: left).
+
+        Returns
+        -------
+        ndarray
+            The value of the cell reached by moving in `direction`.
+        """
+        shifted = grid.copy()
+        shifted[(Ellipsis,) + self._inner(direction)] = grid[(Ellipsis,) + self._outer(direction)]
+        blocked = self.blocked[direction]
+        shifted[..., blocked] = grid[..., blocked]
+        return shifted
+
+    def q_values(self, values: np.ndarray, gamma: float, rewards: np.ndarray = None) -> np.ndarray:
+        """
+        Apply the Bellman backup to every state and action.
+
+        Leading batch dimensions are supported: values shaped (B, S) with
+        a gamma shaped (B, 1) and rewards shaped (S,) or (B, S) back up B
+        problems at once.
+
+        Parameters
+        ----------
+        values : ndarray of float
+            Current state values, shaped (S,) or (B, S).
+        gamma : float or ndarray of float
+            Discount factor for future rewards, broadcastable to `values`.
+        rewards : ndarray of float, optional
+            State rewards, broadcastable to `values` (default is `env.rewards`).
+
+        Returns
+        -------
+        ndarray of float
+            Q-values shaped (S, A), or (B, S, A) for batched values.
+        """
+        env = self.env
+        if rewards is None:
+            rewards = env.rewards
+        targets = rewards + gamma * values
+        batch_shape = targets.shape[:-1]
+        targets = targets.reshape(batch_shape + (env.size, env.size))
+        moved = [self.shift(targets, d) for d in range(4)]
+
+        main_prob = env.main_transition_prob
+        slip_prob = (1 - env.main_transition_prob) / 2
+        q_values = np.empty(batch_shape + (env.n_states, len(env.actions)), dtype=targets.dtype)
+        for a in env.actions:
+            q = main_prob * moved[a]
+            q += np.where(self.slip_masks[a, 0], slip_prob * moved[(a + 1) % 4], 0)
+            q += np.where(self.slip_masks[a, 1], slip_prob * moved[(a - 1) % 4], 0)
+            q_values[..., a] = q.reshape(batch_shape + (env.n_states,))
+        return q_values
+
+    def q_values_for(self, states: np.ndarray, values: np.ndarray, gamma: float,
+                     rewards: np.ndarray = None) -> np.ndarray:
+        """
+        Apply the Bellman backup to a subset of states.
+
+        Neighbors are found with flat index offsets and the same wall and
+        border masks, so the cost is proportional to ``len(states)``.
+
+        Parameters
+        ----------
+        states : ndarray of int
+            The states to back up.
+        values : ndarray of float
+            Current state values, shaped (S,).
+        gamma : float
+            Discount factor for future rewards.
+        rewards : ndarray of float, optional
+            State rewards (default is `env.rewards`).
+
+        Returns
+        -------
+        ndarray of float
+            Q-values shaped (len(states), A).
+        """
+        env = self.env
+        if rewards is None:
+            rewards = env.rewards
+        offsets = [-env.size, 1, env.size, -1]
+        moved = []
+        for d in range(4):
+            blocked = self.blocked[d].ravel()[states]
+            s_prime = np.where(blocked, states, states + offsets[d])
+            moved.append(rewards[s_prime] + gamma * values[s_prime])
+
+        main_prob = env.main_transition_prob
+        slip_prob = (1 - env.main_transition_prob) / 2
+        q_values = np.empty((len(states), len(env.actions)), dtype=moved[0].dtype)
+        for a in env.actions:
+            q = main_prob * moved[a]
+            q += np.where(self.slip_masks[a, 0].ravel()[states], slip_prob * moved[(a + 1) % 4], 0)
+            q += np.where(self.slip_masks[a, 1].ravel()[states], slip_prob * moved[(a - 1) % 4], 0)
+            q_values[:, a] = q
+        return q_values
+
+    @staticmethod
+    def _inner(direction: int) -> tuple:
+        """
+        Slice of the cells that have a neighbor in `direction`.
+
+        Parameters
+        ----------
+        direction : int
+            The direction of the move.
+
+        Returns
+        -------
+        tuple of slice
+            Index into a (size, size) grid.
+        """
+        return [
+            (slice(1, None), slice(None)),
+            (slice(None), slice(None, -1)),
+            (slice(None, -1), slice(None)),
+            (slice(None), slice(1, None)),
+        ][direction]
+
+    @staticmethod
+    def _outer(direction: int) -> tuple:
+        """
+        Slice of the neighbors matching `_inner(direction)`.
+
+        Parameters
+        ----------
+        direction : int
+            The direction of the move.
+
+        Returns
+        -------
+        tuple of slice
+            Index into a (size, size) grid.
+        """
+        return StencilBellmanOperator._inner((direction + 2) % 4)
@@ -0,0 +1,273 @@
+import numpy as np
+from rl_algorithms.core.rl_env.grid_world import GridWorld
+from rl_algorithms.core.algorithms.batch_value_iteration import BatchValueIteration
+
+
+class GoalConditionedValueIteration(BatchValueIteration):
+    """
+    Value iteration toward many goal cells of one map at once.
+
+    Every member of the batch is the map of `env` with a single terminal
+    state, its goal: the environment's own terminal states become ordinary
+    cells, entering the goal yields `goal_reward`, and the penalty rewards
+    are kept. All goals share the dynamics and are solved together by
+    `BatchValueIteration`.
+
+    After `run`, the results are stored compactly as float32 values and
+    int8 greedy actions, one row per goal, and are queried by (goal, state)
+    with `value` and `action`.
+
+    Attributes
+    ----------
+    goals : np.ndarray
+        Goal state of each member, shaped (B,).
+    goal_reward : float
+        Reward received when entering the goal.
+    goal_index : np.ndarray
+        Member index of each state's goal problem, -1 if the state is not a
+        goal, shaped (S,).
+    value_table : np.ndarray or None
+        Converged values as float32, shaped (B, S), None before `run`.
+    action_table : np.ndarray or None
+        Greedy actions as int8, shaped (B, S), with -1 on the goal and on
+        walls. None before `run`.
+    """
+
+    def __init__(self, env: GridWorld, goals=None, gamma: float = 0.9, goal_reward: float = 1.0,
+                 theta: float = 1e-6, backend: str = 'table', chunk_size: int = 256):
+        """
+        Initialize the goal-conditioned solver.
+
+        Parameters
+        ----------
+        env : GridWorld
+            The environment whose dynamics are shared by every goal.
+        goals : array_like, optional
+            Goal states (default is every non-wall state).
+        gamma : float, optional
+            Discount factor shared by every goal (default is 0.9).
+        goal_reward : float, optional
+            Reward received when entering the goal (default is 1.0).
+        theta : float, optional
+            Convergence threshold of each goal (default is 1e-6).
+        backend : str, optional
+            Bellman backup backend, ``'table'`` or ``'stencil'`` (default is ``'table'``).
+        chunk_size : int, optional
+            Largest number of goals backed up together (default is 256).
+
+        Raises
+        ------
+        ValueError
+            If a goal is out of range, a wall, or given twice.
+        """
+        if goals is None:
+            goals = np.flatnonzero(~env.wall_mask)
+        goals = np.asarray(goals, dtype=np.int64).ravel()
+        if np.any((goals < 0) | (goals >= env.n_states)):
+            raise ValueError("goals must be state indices of the grid")
+        if np.any(env.wall_mask[goals]):
+            raise ValueError("goals must not be walls")
+        if len(np.unique(goals)) != len(goals):
+            raise ValueError("goals must be distinct")
+
+        self.goals = goals
+        self.goal_reward = goal_reward
+        self.goal_index = np.full(env.n_states, -1, dtype=np.int64)
+        self.goal_index[goals] = np.arange(len(goals))
+
+        super().__init__(env, np.full(len(goals), gamma), self._base_rewards(env),
+                         theta=theta, backend=backend, chunk_size=chunk_size)
+
+    @staticmethod
+    def _base_rewards(env: GridWorld) -> np.ndarray:
+        """
+        Rewards of the map without its own terminal states.
+
+        Parameters
+        ----------
+        env : GridWorld
+            The environment.
+
+        Returns
+        -------
+        np.ndarray
+            `env.rewards` with the terminal states' rewards set to zero.
+        """
+        rewards = env.rewards.copy()
+        rewards[env.terminal_mask] = 0.0
+        return rewards
+
+    def reset(self) -> None:
+        """
+        Reset every goal to zero values and drop the stored results.
+
+        Returns
+        -------
+        None
+        """
+        super().reset()
+        self.value_table = None
+        self.action_table = None
+
+    def model_changed(self, states: np.ndarray) -> None:
+        """
+        Re-solve every goal on the changed map.
+
+        The base rewards are rebuilt from the environment and the stored
+        results are dropped until the next `run`.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The states whose reward, kind or transitions changed.
+
+        Returns
+        -------
+        None
+        """
+        self.rewards = self._base_rewards(self.env)
+        self.value_table = None
+        self.action_table = None
+        super().model_changed(states)
+
+    def run(self, max_sweeps: int = 1000) -> None:
+        """
+        Sweep until every goal converges, then store the compact results.
+
+        Parameters
+        ----------
+        max_sweeps : int, optional
+            Maximum number of sweeps (default is 1000).
+
+        Returns
+        -------
+        None
+        """
+        super().run(max_sweeps)
+        self.store_results()
+
+    def store_results(self) -> None:
+        """
+        Store the current values and greedy actions compactly.
+
+        Returns
+        -------
+        None
+        """
+        self.value_table = self.values.astype(np.float32)
+        self.action_table = np.empty(self.values.shape, dtype=np.int8)
+        for members in self._chunks(np.arange(self.n_members)):
+            actions = self.greedy_actions(members)
+            actions[~self._member_mask(members)] = -1
+            self.action_table[members] = actions
+
+    def value(self, goal, state):
+        """
+        Look up the value of states toward goals.
+
+        Parameters
+        ----------
+        goal : int or array_like
+            Goal states, one of `goals`.
+        state : int or array_like
+            States, broadcast against `goal`.
+
+        Returns
+        -------
+        float or np.ndarray
+            The stored values.
+        """
+        return self.value_table[self._members_of(goal), state]
+
+    def action(self, goal, state):
+        """
+        Look up the greedy action of states toward goals.
+
+        Parameters
+        ----------
+        goal : int or array_like
+            Goal states, one of `goals`.
+        state : int or array_like
+            States, broadcast against `goal`.
+
+        Returns
+        -------
+        int or np.ndarray
+            The stored actions, -1 on the goal and on walls.
+        """
+        return self.action_table[self._members_of(goal), state]
+
+    def _members_of(self, goal):
+        """
+        Map goal states to member indices.
+
+        Parameters
+        ----------
+        goal : int or array_like
+            Goal states.
+
+        Returns
+        -------
+        int or np.ndarray
+            Member index of each goal.
+
+        Raises
+        ------
+        RuntimeError
+            If the results have not been stored yet.
+        KeyError
+            If a state is not one of `goals`.
+        """
+        if self.value_table is None:
+            raise RuntimeError("No results stored, call run() first")
+        members = self.goal_index[goal]
+        if np.any(members < 0):
+            raise KeyError(f"Not a goal of this solver: {goal}")
+        return members
+
+    def _member_rewards(self, members: np.ndarray) -> np.ndarray:
+        """
+        Build the reward vectors of members, with the goal reward on their goal.
+
+        Parameters
+        ----------
+        members : np.ndarray
+            Indices of the members.
+
+        Returns
+        -------
+        np.ndarray
+            Rewards shaped (len(members), S).
+        """
+        rewards = np.repeat(self.rewards[None], len(members), axis=0)
+        rewards[np.arange(len(members)), self.goals[members]] = self.goal_reward
+        return rewards
+
+    def _member_mask(self, members: np.ndarray) -> np.ndarray:
+        """
+        Build the update masks of members, with their goal as the only terminal state.
+
+        Parameters
+        ----------
+        members : np.ndarray
+            Indices of the members.
+
+        Returns
+        -------
+        np.ndarray
+            Masks shaped (len(members), S).
+        """
+        mask = np.repeat(~self.env.wall_mask[None], len(members), axis=0)
+        mask[np.arange(len(members)), self.goals[members]] = False
+        return mask
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the algorithm.
+
+        Returns
+        -------
+        str
+            The name of the algorithm ("Goal-Conditioned Value Iteration").
+        """
+        return "Goal-Conditioned Value Iteration"
@@ -0,0 +1,68 @@
+import numpy as np
+
+
+def bicgstab(matvec, b: np.ndarray, x0: np.ndarray = None, tol: float = 1e-10,
+             max_iter: int = 1000) -> tuple:
+    """
+    Solve ``A x = b`` with the stabilized bi-conjugate gradient method.
+
+    BiCGSTAB is a Krylov solver for non-symmetric systems that only needs
+    matrix-vector products, so `A` never has to be stored densely.
+
+    Parameters
+    ----------
+    matvec : callable
+        Function returning ``A @ x`` for a vector ``x``.
+    b : np.ndarray
+        Right-hand side.
+    x0 : np.ndarray, optional
+        Initial guess (default is zeros).
+    tol : float, optional
+        Relative residual ``||b - A x|| / ||b||`` to reach (default is 1e-10).
+    max_iter : int, optional
+        Maximum number of iterations (default is 1000).
+
+    Returns
+    -------
+    tuple
+        The solution and the number of iterations performed.
+
+    Raises
+    ------
+    RuntimeError
+        If the solver breaks down or does not converge within `max_iter`.
+    """
+    x = np.zeros_like(b) if x0 is None else x0.astype(b.dtype, copy=True)
+    r = b - matvec(x)
+    b_norm = np.linalg.norm(b)
+    if b_norm == 0.0:
+        b_norm = 1.0
+    if np.linalg.norm(r) / b_norm <= tol:
+        return x, 0
+
+    r_hat = r.copy()
+    rho = alpha = omega = 1.0
+    v = np.zeros_like(b)
+    p = np.zeros_like(b)
+    for i in range(1, max_iter + 1):
+        rho_new = np.dot(r_hat, r)
+        if rho_new == 0.0:
+            raise RuntimeError("BiCGSTAB broke down (rho = 0)")
+        beta = (rho_new / rho) * (alpha / omega)
+        rho = rho_new
+        p = r + beta * (p - omega * v)
+        v = matvec(p)
+        alpha = rho / np.dot(r_hat, v)
+        s = r - alpha * v
+        if np.linalg.norm(s) / b_norm <= tol:
+            return x + alpha * p, i
+        t = matvec(s)
+        t_norm = np.dot(t, t)
+        if t_norm == 0.0:
+            raise RuntimeError("BiCGSTAB broke down (t = 0)")
+        omega = np.dot(t, s) / t_norm
+        x = x + alpha * p + omega * s
+        r = s - omega * t
+        if np.linalg.norm(r) / b_norm <= tol:
+            return x, i
+    raise RuntimeError(f"BiCGSTAB did not converge in {max_iter} iterations")
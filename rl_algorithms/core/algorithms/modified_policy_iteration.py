@@ -0,0 +1,162 @@
+import numpy as np
+from rl_algorithms.core.algorithms.policy_iteration import PolicyIteration
+
+
+class ModifiedPolicyIteration(PolicyIteration):
+    """
+    Modified Policy Iteration with an adaptive evaluation depth.
+
+    Each `step` runs up to `k` policy evaluation sweeps followed by one
+    policy improvement. With ``k = 1`` this is value iteration, and with
+    ``k`` large enough to converge the evaluation it is policy iteration.
+    The depth is adapted after every improvement by comparing the last
+    evaluation `delta` with the improvement gap, the largest gain
+    max_a Q(s, a) - Q(s, pi(s)) the improvement can bring:
+
+    - if actions changed and the gap exceeds `delta`, improving pays off
+      more than evaluating further, so `k` is halved;
+    - if no action changed, or the gap is smaller than `delta`, the
+      evaluation is the bottleneck, so `k` is doubled.
+
+    Attributes
+    ----------
+    k : int
+        Current number of evaluation sweeps per improvement.
+    k_min : int
+        Smallest evaluation depth.
+    k_max : int
+        Largest evaluation depth.
+    theta : float
+        Evaluation stops early once `delta` drops below this threshold.
+    total_sweeps : int
+        Number of evaluation sweeps performed since the last reset.
+    last_policy_changes : int
+        Number of states whose action changed in the last improvement.
+    last_improvement_gap : float
+        Improvement gap observed before the last improvement.
+    """
+
+    def __init__(self, env, gamma: float = 0.9, seed: int = 42, backend: str = 'table',
+                 in_place: bool = False, sweep_order: str = 'row_major', n_workers: int = None,
+                 k: int = 4, k_min: int = 1, k_max: int = 256,
+                 theta: float = 1e-6):
+        """
+        Initialize the Modified Policy Iteration algorithm.
+
+        Parameters
+        ----------
+        env : GridWorld
+            The environment to interact with.
+        gamma : float, optional
+            Discount factor for future rewards (default is 0.9).
+        seed : int, optional
+            Random seed for reproducibility (default is 42).
+        backend : str, optional
+            Bellman backup backend, ``'table'`` or ``'stencil'`` (default is ``'table'``).
+        in_place : bool, optional
+            Whether to use in-place Gauss-Seidel sweeps (default is False).
+        sweep_order : str, optional
+            State ordering of in-place sweeps (default is ``'row_major'``).
+        n_workers : int, optional
+            Number of worker processes for synchronous sweeps (default is None).
+        k : int, optional
+            Initial number of evaluation sweeps per improvement (default is 4).
+        k_min : int, optional
+            Smallest evaluation depth (default is 1).
+        k_max : int, optional
+            Largest evaluation depth (default is 256).
+        theta : float, optional
+            Evaluation convergence threshold (default is 1e-6).
+        """
+        self.initial_k = k
+        self.k_min = k_min
+        self.k_max = k_max
+        self.theta = theta
+        super().__init__(env, gamma, seed, backend=backend, in_place=in_place, sweep_order=sweep_order,
+                         n_workers=n_workers)
+
+    def reset(self) -> None:
+        """
+        Reset the algorithm's internal state and the evaluation depth.
+
+        Returns
+        -------
+        None
+        """
+        super().reset()
+        self.k = self.initial_k
+        self.total_sweeps = 0
+        self.last_policy_changes = 0
+        self.last_improvement_gap = 0.0
+
+    def step(self) -> bool:
+        """
+        Run up to `k` evaluation sweeps, one improvement, then adapt `k`.
+
+        Returns
+        -------
+        bool
+            True if the policy did not change and its evaluation converged,
+            False otherwise.
+        """
+        sweeps = 0
+        delta = np.inf
+        while sweeps < self.k and not self.has_converged(delta, self.theta):
+            delta = self.policy_evaluation_step()
+            sweeps += 1
+        self.total_sweeps += sweeps
+
+        self.last_improvement_gap = self.improvement_gap()
+        old_actions = self.policy_actions
+        is_converged = self.policy_improvement_step()
+        self.last_policy_changes = self.count_policy_changes(old_actions)
+
+        if self.last_policy_changes and self.last_improvement_gap > delta:
+            self.k = max(self.k_min, self.k // 2)
+        else:
+            self.k = min(self.k_max, self.k * 2)
+        return is_converged and self.has_converged(delta, self.theta)
+
+    def improvement_gap(self) -> float:
+        """
+        Largest Q-value gain a greedy improvement can bring.
+
+        Returns
+        -------
+        float
+            max_s (max_a Q(s, a) - sum_a pi(a|s) Q(s, a)) over updated states.
+        """
+        mask = self.update_mask
+        gaps = np.max(self.q_values, axis=1) - self.policy_weighted_sum(self.q_values)
+        return float(np.max(gaps[mask], initial=0.0))
+
+    def count_policy_changes(self, old_actions: np.ndarray) -> int:
+        """
+        Count the states whose action changed in the last improvement.
+
+        Parameters
+        ----------
+        old_actions : np.ndarray or None
+            The deterministic policy before the improvement, or None if it
+            was stochastic.
+
+        Returns
+        -------
+        int
+            Number of changed states; every improved state counts if the
+            previous policy was stochastic.
+        """
+        if old_actions is None:
+            return int(np.count_nonzero(~self.env.terminal_mask))
+        return int(np.count_nonzero(old_actions != self.policy_actions))
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the algorithm.
+
+        Returns
+        -------
+        str
+            The name of the algorithm ("Modified Policy Iteration").
+        """
+        return "Modified Policy Iteration"
@@ -0,0 +1,347 @@
+import multiprocessing as mp
+import os
+import threading
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+_STOP, _SWEEP = 0, 1
+
+
+def _shared_array(shape: tuple, dtype) -> tuple:
+    """
+    Allocate a zeroed array in a new shared memory block.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the array.
+    dtype : data-type
+        Data type of the array.
+
+    Returns
+    -------
+    tuple
+        The `SharedMemory` block and the array viewing it.
+    """
+    nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+    shm = shared_memory.SharedMemory(create=True, size=nbytes)
+    array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    array.fill(0)
+    return shm, array
+
+
+class SharedMemorySweepEngine:
+    """
+    Synchronous Bellman sweeps split over worker processes.
+
+    The grid is partitioned into contiguous blocks of rows, one per worker.
+    The values are double-buffered and, like the Q-values and the policy,
+    live in `multiprocessing.shared_memory`. Each sweep, every worker backs
+    up the states of its block from the read buffer into the write buffer,
+    stores its block's `delta`, and waits at a barrier; the main process
+    then combines the block deltas and swaps the buffers. The algorithm's
+    `values` and `q_values` are rebound to the shared arrays, so the rest of
+    the algorithm keeps working on them as usual.
+
+    Workers are forked from the main process when the first sweep runs and
+    reduce Q-values with their copy of the algorithm's `state_values`, so
+    any `GeneralizedPolicyIteration` subclass can use the engine. The
+    policy is copied to shared memory whenever its `policy_version` changes.
+
+    Attributes
+    ----------
+    algorithm : GeneralizedPolicyIteration
+        The algorithm whose sweeps are run.
+    n_workers : int
+        Number of worker processes.
+    row_blocks : list of tuple
+        ``(start, stop)`` state range of each worker's block of rows.
+    """
+
+    def __init__(self, algorithm, n_workers: int = None):
+        """
+        Initialize the engine and move the algorithm's arrays to shared memory.
+
+        Parameters
+        ----------
+        algorithm : GeneralizedPolicyIteration
+            The algorithm whose sweeps are run.
+        n_workers : int, optional
+            Number of worker processes (default is one per CPU core, at most
+            one per grid row).
+
+        Raises
+        ------
+        ValueError
+            If the platform cannot fork worker processes.
+        """
+        env = algorithm.env
+        self._context = mp.get_context('fork')
+        self.algorithm = algorithm
+        self.n_workers = max(1, min(n_workers or os.cpu_count() or 1, env.size))
+
+        rows = np.array_split(np.arange(env.size), self.n_workers)
+        self.row_blocks = [(int(r[0]) * env.size, (int(r[-1]) + 1) * env.size) for r in rows]
+
+        dtype = algorithm.values.dtype
+        n_states, n_actions = algorithm.q_values.shape
+        self._blocks = []
+        self._buffers = []
+        for _ in range(2):
+            shm, array = _shared_array((n_states,), dtype)
+            self._blocks.append(shm)
+            self._buffers.append(array)
+        for name, shape, array_dtype in [
+            ('_q_values', (n_states, n_actions), algorithm.q_values.dtype),
+            ('_policy_probs', (n_states, n_actions), algorithm.dtype),
+            ('_policy_actions', (n_states,), np.int8),
+            ('_deltas', (self.n_workers,), np.float64),
+            ('_gamma', (1,), np.float64),
+            # command, read buffer, policy version, policy is deterministic
+            ('_control', (4,), np.int64),
+        ]:
+            shm, array = _shared_array(shape, array_dtype)
+            self._blocks.append(shm)
+            setattr(self, name, array)
+
+        self._read = 0
+        self._synced_version = None
+        self._barrier = None
+        self._workers = []
+        self._finalizer = weakref.finalize(self, SharedMemorySweepEngine._shutdown, os.getpid(),
+                                           self._workers, self._blocks, self._control, [None])
+        self.attach()
+
+    def attach(self) -> None:
+        """
+        Copy the algorithm's values and Q-values into shared memory and rebind them.
+
+        Called again after the algorithm reallocates its arrays, e.g. on `reset`.
+
+        Returns
+        -------
+        None
+        """
+        algorithm = self.algorithm
+        current = self._buffers[self._read]
+        if algorithm.values is not current:
+            current[:] = algorithm.values
+            algorithm.values = current
+        if algorithm.q_values is not self._q_values:
+            self._q_values[:] = algorithm.q_values
+            algorithm.q_values = self._q_values
+
+    def sweep(self) -> float:
+        """
+        Run one synchronous sweep on the workers.
+
+        Returns
+        -------
+        float
+            Maximum value change (`delta`) during the sweep.
+
+        Raises
+        ------
+        RuntimeError
+            If a worker failed during the sweep.
+        """
+        self.attach()
+        if not self._workers:
+            self._start()
+        self._sync_policy()
+
+        self._gamma[0] = self.algorithm.gamma
+        self._control[0] = _SWEEP
+        self._control[1] = self._read
+        try:
+            self._barrier.wait()
+            self._barrier.wait()
+        except threading.BrokenBarrierError:
+            raise RuntimeError("A sweep worker failed") from None
+
+        self._read = 1 - self._read
+        self.algorithm.values = self._buffers[self._read]
+        return float(self._deltas.max())
+
+    def close(self) -> None:
+        """
+        Stop the workers and release the shared memory.
+
+        The algorithm keeps private copies of its values and Q-values.
+
+        Returns
+        -------
+        None
+        """
+        algorithm = self.algorithm
+        algorithm.values = np.array(algorithm.values)
+        algorithm.q_values = np.array(algorithm.q_values)
+        self._finalizer()
+
+    def restart(self) -> None:
+        """
+        Stop the workers, so the next sweep forks them again.
+
+        Workers hold a copy of the environment taken when they were forked;
+        call this after the environment changed.
+
+        Returns
+        -------
+        None
+        """
+        self._stop_workers(self._workers, self._control, [self._barrier])
+        self._synced_version = None
+
+    def _sync_policy(self) -> None:
+        """
+        Copy the algorithm's policy to shared memory if it changed.
+
+        Returns
+        -------
+        None
+        """
+        algorithm = self.algorithm
+        if self._synced_version == algorithm.policy_version:
+            return
+        if algorithm.is_deterministic:
+            self._policy_actions[:] = algorithm.policy_actions
+        else:
+            self._policy_probs[:] = algorithm.policy
+        self._control[3] = algorithm.is_deterministic
+        self._control[2] = algorithm.policy_version
+        self._synced_version = algorithm.policy_version
+
+    def _start(self) -> None:
+        """
+        Fork one worker process per block of rows.
+
+        Returns
+        -------
+        None
+        """
+        self._barrier = self._context.Barrier(self.n_workers + 1)
+        self._finalizer.detach()
+        for worker, (start, stop) in enumerate(self.row_blocks):
+            process = self._context.Process(target=self._run_worker, args=(worker, start, stop),
+                                            daemon=True)
+            process.start()
+            self._workers.append(process)
+        self._finalizer = weakref.finalize(self, SharedMemorySweepEngine._shutdown, os.getpid(),
+                                           self._workers, self._blocks, self._control,
+                                           [self._barrier])
+
+    def _run_worker(self, worker: int, start: int, stop: int) -> None:
+        """
+        Worker loop: back up one block of rows per sweep until stopped.
+
+        Parameters
+        ----------
+        worker : int
+            Index of the worker.
+        start : int
+            First state of the block.
+        stop : int
+            End (exclusive) of the block.
+
+        Returns
+        -------
+        None
+        """
+        algorithm = self.algorithm
+        states = np.arange(start, stop)
+        states = states[algorithm.update_mask[states]]
+        version = None
+        try:
+            while True:
+                self._barrier.wait()
+                if self._control[0] == _STOP:
+                    return
+
+                if self._control[2] != version:
+                    version = int(self._control[2])
+                    if self._control[3]:
+                        algorithm.set_deterministic_policy(self._policy_actions.copy())
+                    else:
+                        algorithm.policy = self._policy_probs.copy()
+
+                read = self._buffers[self._control[1]]
+                write = self._buffers[1 - self._control[1]]
+                q_values = algorithm.bellman.q_values_for(states, read, float(self._gamma[0]))
+                values = algorithm.state_values(q_values, states)
+
+                write[start:stop] = read[start:stop]
+                write[states] = values
+                self._q_values[states] = q_values
+                self._deltas[worker] = np.max(np.abs(values - read[states]), initial=0.0)
+                self._barrier.wait()
+        except threading.BrokenBarrierError:
+            return
+        except BaseException:
+            self._barrier.abort()
+            raise
+
+    @staticmethod
+    def _stop_workers(workers: list, control: np.ndarray, barrier: list) -> None:
+        """
+        Tell the workers to exit and wait for them.
+
+        Parameters
+        ----------
+        workers : list of Process
+            The worker processes, emptied in place.
+        control : np.ndarray
+            The shared control array.
+        barrier : list
+            One-element list holding the start barrier, or None.
+
+        Returns
+        -------
+        None
+        """
+        if workers and barrier[0] is not None:
+            control[0] = _STOP
+            try:
+                barrier[0].wait(timeout=1.0)
+            except threading.BrokenBarrierError:
+                pass
+            for process in workers:
+                process.join(timeout=1.0)
+                if process.is_alive():
+                    process.terminate()
+        del workers[:]
+
+    @staticmethod
+    def _shutdown(pid: int, workers: list, blocks: list, control: np.ndarray, barrier: list) -> None:
+        """
+        Stop the workers and unlink the shared memory blocks.
+
+        Parameters
+        ----------
+        pid : int
+            The process owning the engine; other processes do nothing.
+        workers : list of Process
+            The worker processes.
+        blocks : list of SharedMemory
+            The shared memory blocks.
+        control : np.ndarray
+            The shared control array.
+        barrier : list
+            One-element list holding the start barrier, or None.
+
+        Returns
+        -------
+        None
+        """
+        if os.getpid() != pid:
+            # A forked worker collecting its copy of the engine
+            return
+        SharedMemorySweepEngine._stop_workers(workers, control, barrier)
+        for shm in blocks:
+            try:
+                shm.close()
+            except BufferError:
+                # Arrays still view the block; it is freed once they are gone
+                pass
+            shm.unlink()
@@ -1,5 +1,6 @@
 import numpy as np
 from rl_algorithms.core.algorithms.base import GeneralizedPolicyIteration
+from rl_algorithms.core.algorithms.linear_solvers import bicgstab
 
 class PolicyIteration(GeneralizedPolicyIteration):
     """
@@ -8,17 +9,83 @@ class PolicyIteration(GeneralizedPolicyIteration):
     This class implements the Policy Iteration algorithm, which alternates
     between policy evaluation and policy improvement steps until the policy
     converges. It is a subclass of `GeneralizedPolicyIteration`.
+
+    Attributes
+    ----------
+    evaluation : str
+        ``'sweep'`` evaluates the policy with one Bellman sweep per step,
+        ``'exact'`` solves the linear system (I - gamma P_pi) V = r instead.
+    direct_solver_max_states : int
+        Largest number of states solved with a dense direct solver; bigger
+        maps use the BiCGSTAB Krylov solver.
+    improvement_tolerance : float or None
+        Q-value margin an action needs to replace the current one during
+        policy improvement, see `greedy_policy_improvement`.
     """
 
+    EVALUATIONS = ('sweep', 'exact')
+
+    def __init__(self, env, gamma: float = 0.9, seed: int = 42, backend: str = 'table',
+                 in_place: bool = False, sweep_order: str = 'row_major', n_workers: int = None,
+                 evaluation: str = 'sweep', direct_solver_max_states: int = 1000,
+                 improvement_tolerance: float = None):
+        """
+        Initialize the Policy Iteration algorithm.
+
+        Parameters
+        ----------
+        env : GridWorld
+            The environment to interact with.
+        gamma : float, optional
+            Discount factor for future rewards (default is 0.9).
+        seed : int, optional
+            Random seed for reproducibility (default is 42).
+        backend : str, optional
+            Bellman backup backend, ``'table'`` or ``'stencil'`` (default is ``'table'``).
+        in_place : bool, optional
+            Whether to use in-place Gauss-Seidel sweeps (default is False).
+        sweep_order : str, optional
+            State ordering of in-place sweeps (default is ``'row_major'``).
+        n_workers : int, optional
+            Number of worker processes for synchronous sweeps (default is None).
+        evaluation : str, optional
+            Policy evaluation mode, ``'sweep'`` or ``'exact'`` (default is ``'sweep'``).
+        direct_solver_max_states : int, optional
+            Largest number of states solved directly (default is 1000).
+        improvement_tolerance : float, optional
+            Q-value margin needed to change an action (default is None for
+            sweep evaluation and 1e-10 for exact evaluation, whose solver
+            round-off would otherwise keep flipping ties).
+
+        Raises
+        ------
+        ValueError
+            If the evaluation mode is unknown, or exact evaluation is selected
+            for an environment built without a transition model.
+        """
+        if evaluation not in self.EVALUATIONS:
+            raise ValueError(f"Unknown evaluation '{evaluation}', expected one of {self.EVALUATIONS}")
+        if evaluation == 'exact' and env.transition_probs is None:
+            raise ValueError("Exact evaluation needs an environment built with build_model=True")
+        self.evaluation = evaluation
+        self.direct_solver_max_states = direct_solver_max_states
+        if improvement_tolerance is None and evaluation == 'exact':
+            improvement_tolerance = 1e-10
+        self.improvement_tolerance = improvement_tolerance
+        super().__init__(env, gamma, seed, backend=backend, in_place=in_place, sweep_order=sweep_order,
+                         n_workers=n_workers)
 
     def policy_evaluation_step(self) -> float:
         """
         Perform a single policy evaluation step.
 
         This method computes the state values under the current policy using
-        the Bellman expectation equation. It updates the state value estimates
-        based on the weighted sum of Q-values for each action, considering the
-        current policy probabilities.
+        the Bellman expectation equation. All Q-values are computed in one
+        batched backup, then reduced with the current policy probabilities.
+        Terminal and wall states are masked out of the update. With
+        ``in_place=True`` the sweep is a Gauss-Seidel sweep in `sweep_order`.
+        With ``evaluation='exact'`` the policy is evaluated exactly by
+        `exact_policy_evaluation` instead.
 
         Returns
         -------
@@ -26,34 +93,74 @@ class PolicyIteration(GeneralizedPolicyIteration):
             Maximum value change (`delta`) across all states during the
             evaluation step, which serves as a convergence metric.
         """
-        delta = 0
-        old_values = self.values.copy()
+        if self.evaluation == 'exact':
+            return self.exact_policy_evaluation()
+        return self.sweep()
 
-        for s in range(self.env.n_states):
-            # Skip terminal and wall states
-            if s in self.env.terminal_states or s in self.env.walls:
-                continue
+    def exact_policy_evaluation(self) -> float:
+        """
+        Evaluate the current policy exactly with one linear solve.
 
-            # Compute state value under current policy
-            v = 0
-            for a in self.env.actions:
-                q = 0
-                for s_prime in self.env.get_possible_successors(s, a):
-                    # Bellman expectation equation
-                    q += (self.env.transition_probs[s, a, s_prime] *
-                          (self.env.rewards[s_prime] + self.gamma * old_values[s_prime]))
+        The policy's sparse transition matrix P_pi and expected reward r_pi
+        are formed from `env.transition_probs` and `env.rewards`, and
+        (I - gamma P_pi) V = r_pi is solved for the non-terminal, non-wall
+        states, whose rows in P_pi are the only non-zero ones. The other
+        states keep their current values. Small maps use a dense direct
+        solver, larger ones BiCGSTAB warm-started from the current values.
 
-                # Store Q-values
-                self.q_values[s, a] = q
-                # Weighted sum by policy probabilities
-                v += self.policy[s, a] * q
+        Returns
+        -------
+        float
+            Maximum value change (`delta`) across all states.
+        """
+        env = self.env
+        model = env.transition_probs
+        mask = self.update_mask
+        old_values = self.values.copy()
+
+        # Sparse P_pi in coordinate form: one entry per stored transition
+        pairs = np.repeat(np.arange(env.n_states * model.n_actions), np.diff(model.indptr))
+        rows, actions = pairs // model.n_actions, pairs % model.n_actions
+        weights = self.policy[rows, actions] * model.probs
+        keep = (weights != 0.0) & mask[rows]
+        rows, cols, weights = rows[keep], model.indices[keep], weights[keep]
+
+        # Fixed states are identity rows holding their current value
+        r_pi = np.bincount(rows, weights=weights * env.rewards[cols], minlength=env.n_states)
+        rhs = np.where(mask, r_pi, old_values)
+
+        if env.n_states <= self.direct_solver_max_states:
+            system = np.eye(env.n_states)
+            np.add.at(system, (rows, cols), -self.gamma * weights)
+            values = np.linalg.solve(system, rhs)
+        else:
+            def matvec(x):
+                return x - self.gamma * np.bincount(rows, weights=weights * x[cols],
+                                                    minlength=env.n_states)
+            values, _ = bicgstab(matvec, rhs, x0=old_values)
+
+        self.values[mask] = values[mask]
+        q_values = self.bellman.q_values(self.values, self.gamma)
+        self.q_values[mask] = q_values[mask]
+        return np.max(np.abs(old_values - self.values), initial=0.0)
+
+    def state_values(self, q_values: np.ndarray, states: np.ndarray = None) -> np.ndarray:
+        """
+        Expected Q-value of each state under the current policy.
 
-            # Update state value
-            self.values[s] = v
-            # Track maximum value change
-            delta = max(delta, np.abs(old_values[s] - self.values[s]))
+        Parameters
+        ----------
+        q_values : np.ndarray
+            Q-values of `states`, shaped (len(states), n_actions).
+        states : np.ndarray, optional
+            The states the Q-values belong to (default is all states).
 
-        return delta
+        Returns
+        -------
+        np.ndarray
+            The new value of each state.
+        """
+        return self.policy_weighted_sum(q_values, states)
 
     def policy_improvement_step(self) -> bool:
         """
@@ -68,7 +175,7 @@ class PolicyIteration(GeneralizedPolicyIteration):
         bool
             True if the policy has converged (no changes were made), False otherwise.
         """
-        return self.greedy_policy_improvement()
+        return self.greedy_policy_improvement(self.improvement_tolerance)
 
     def __str__(self) -> str:
         """
@@ -0,0 +1,120 @@
+from bisect import bisect_right
+
+import numpy as np
+
+
+class PolicySampler:
+    """
+    Action sampling table built once from a policy.
+
+    Each state gets the cumulative distribution of its action
+    probabilities, normalized so the last entry is exactly 1. An action is
+    then drawn with one uniform number and a search of the row, without
+    the validation `rng.choice` does on every call. With only a few actions
+    per state this is as cheap as an alias table and simpler to build.
+
+    Deterministic policies skip the table: their action is looked up
+    directly, and only states without an action (-1) are sampled uniformly.
+
+    Parameters
+    ----------
+    probs : np.ndarray or None
+        Action probabilities of shape (n_states, n_actions), or None when
+        `actions` is given.
+    actions : np.ndarray, optional
+        One action per state, or -1 to act uniformly at random.
+    n_actions : int, optional
+        Number of actions, needed with `actions` only (default is 4).
+
+    Attributes
+    ----------
+    cdf : np.ndarray or None
+        Cumulative action probabilities of shape (n_states, n_actions), or
+        None for a deterministic policy.
+    actions : np.ndarray or None
+        The deterministic actions, or None for a stochastic policy.
+    n_actions : int
+        Number of actions.
+    """
+
+    def __init__(self, probs: np.ndarray = None, actions: np.ndarray = None, n_actions: int = 4):
+        """
+        Build the sampling table.
+
+        Parameters
+        ----------
+        probs : np.ndarray or None
+            Action probabilities of shape (n_states, n_actions), or None
+            when `actions` is given.
+        actions : np.ndarray, optional
+            One action per state, or -1 to act uniformly at random.
+        n_actions : int, optional
+            Number of actions, needed with `actions` only (default is 4).
+        """
+        self.actions = None if actions is None else np.asarray(actions)
+        self.cdf = None
+        self._rows = None
+        if self.actions is not None:
+            self.n_actions = n_actions
+            return
+
+        probs = np.asarray(probs)
+        self.n_actions = probs.shape[1]
+        cdf = np.cumsum(probs, axis=1, dtype=np.float64)
+        totals = cdf[:, -1:]
+        # Rows without probability mass act uniformly
+        empty = totals[:, 0] <= 0
+        cdf[empty] = np.arange(1, self.n_actions + 1) / self.n_actions
+        totals = np.where(empty[:, None], 1.0, totals)
+        cdf /= totals
+        cdf[:, -1] = 1.0
+        self.cdf = cdf
+
+    def sample(self, states: np.ndarray, rng: np.random.RandomState) -> np.ndarray:
+        """
+        Sample one action in each of many states.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The states to act in.
+        rng : np.random.RandomState
+            Source of the uniform numbers.
+
+        Returns
+        -------
+        np.ndarray
+            One action per state.
+        """
+        states = np.asarray(states)
+        if self.actions is not None:
+            actions = self.actions[states].astype(np.int64)
+            undecided = actions < 0
+            if undecided.any():
+                actions[undecided] = rng.randint(self.n_actions, size=int(undecided.sum()))
+            return actions
+        u = rng.rand(len(states))
+        return np.count_nonzero(u[:, None] >= self.cdf[states], axis=1)
+
+    def sample_one(self, state: int, rng: np.random.RandomState) -> int:
+        """
+        Sample an action in a single state.
+
+        Parameters
+        ----------
+        state : int
+            The state to act in.
+        rng : np.random.RandomState
+            Source of the uniform number.
+
+        Returns
+        -------
+        int
+            The sampled action.
+        """
+        if self.actions is not None:
+            action = int(self.actions[state])
+            return action if action >= 0 else int(rng.randint(self.n_actions))
+        if self._rows is None:
+            self._rows = self.cdf.tolist()
+        return bisect_right(self._rows[state], rng.rand())
@@ -0,0 +1,287 @@
+import heapq
+import numpy as np
+from rl_algorithms.core.algorithms.value_iteration import ValueIteration
+
+
+class PrioritizedSweeping(ValueIteration):
+    """
+    Prioritized sweeping value iteration.
+
+    Instead of sweeping over every state, this algorithm keeps a priority
+    queue of states keyed by their Bellman residual |max_a Q(s, a) - V(s)|.
+    The states with the largest residuals are backed up first, and whenever a
+    state's value changes, the residuals of its predecessors are recomputed
+    and pushed to the queue. States whose residual is below `theta` are
+    never backed up, so converged regions of the map cost nothing.
+
+    Attributes
+    ----------
+    theta : float
+        Smallest Bellman residual worth a backup.
+    backups_per_step : int
+        Maximum number of backups performed by one `policy_evaluation_step`.
+    batch_size : int
+        Number of highest-priority states popped and backed up together.
+    n_backups : int
+        Total number of backups performed since the last reset.
+    """
+
+    def __init__(self, env, gamma: float = 0.9, seed: int = 42, backend: str = 'table',
+                 theta: float = 1e-6, backups_per_step: int = None, batch_size: int = 32):
+        """
+        Initialize the prioritized sweeping algorithm.
+
+        Parameters
+        ----------
+        env : GridWorld
+            The environment to interact with.
+        gamma : float, optional
+            Discount factor for future rewards (default is 0.9).
+        seed : int, optional
+            Random seed for reproducibility (default is 42).
+        backend : str, optional
+            Bellman backup backend, ``'table'`` or ``'stencil'`` (default is ``'table'``).
+        theta : float, optional
+            Smallest Bellman residual worth a backup (default is 1e-6).
+        backups_per_step : int, optional
+            Maximum number of backups per evaluation step (default is the
+            number of states, the cost of one full sweep).
+        batch_size : int, optional
+            Number of states backed up together (default is 32). A batch of
+            one gives classic state-by-state prioritized sweeping; larger
+            batches amortize the interpreter overhead on big maps.
+        """
+        self.theta = theta
+        self.backups_per_step = backups_per_step or env.n_states
+        self.batch_size = batch_size
+        super().__init__(env, gamma, seed, backend=backend)
+        self.pred_indptr, self.pred_states = self.build_predecessors()
+
+    def reset(self) -> None:
+        """
+        Reset the algorithm's internal state and empty the priority queue.
+
+        Returns
+        -------
+        None
+        """
+        super().reset()
+        self.n_backups = 0
+        self._queue = None
+        self._priority = np.zeros(self.env.n_states)
+        self._threshold = self.theta
+
+    def warm_start(self, source=None, values: np.ndarray = None, q_values: np.ndarray = None,
+                   policy: np.ndarray = None) -> None:
+        """
+        Seed the solution from a prior one and empty the priority queue.
+
+        The queue is seeded again from the new values on the next step.
+
+        Parameters
+        ----------
+        source : RLAlgorithm or dict, optional
+            Another algorithm on an environment with the same layout, or a
+            solution returned by `get_solution`.
+        values : np.ndarray, optional
+            State values, shaped (S,).
+        q_values : np.ndarray, optional
+            Q-values, shaped (S, A).
+        policy : np.ndarray, optional
+            One action per state shaped (S,), or action probabilities
+            shaped (S, A).
+
+        Returns
+        -------
+        None
+        """
+        super().warm_start(source, values, q_values, policy)
+        self._queue = None
+        self._priority[:] = 0.0
+
+    def model_changed(self, states: np.ndarray) -> None:
+        """
+        Re-solve locally after the environment changed.
+
+        The predecessor lists are rebuilt, and the changed states and their
+        predecessors, the only states whose backups changed, are requeued
+        with their new residuals. The rest of the queue and of the values
+        is kept.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The states whose reward, kind or transitions changed.
+
+        Returns
+        -------
+        None
+        """
+        super().model_changed(states)
+        self.pred_indptr, self.pred_states = self.build_predecessors()
+        self._priority[~self.update_mask] = 0.0
+        if self._queue is None:
+            return
+
+        affected = np.unique(np.concatenate([states] + [
+            self.pred_states[self.pred_indptr[s]:self.pred_indptr[s + 1]] for s in states
+        ]))
+        affected = affected[self.update_mask[affected]]
+        q_values = self.bellman.q_values_for(affected, self.values, self.gamma)
+        self.q_values[affected] = q_values
+        residuals = np.abs(np.max(q_values, axis=1) - self.values[affected])
+        for s, residual in zip(affected, residuals):
+            self._push(s, residual)
+
+    def build_predecessors(self) -> tuple:
+        """
+        Build the predecessor lists of every state in CSR form.
+
+        Every successor of a state is reached by one of its deterministic
+        moves, so the predecessors are read from `env.move_table`.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            ``(indptr, states)``: the predecessors of ``s`` are
+            ``states[indptr[s]:indptr[s + 1]]``.
+        """
+        env = self.env
+        sources = np.repeat(np.arange(env.n_states), len(env.actions))
+        targets = env.move_table.ravel().astype(np.int64)
+        pairs = np.unique(targets * env.n_states + sources)
+        targets, sources = pairs // env.n_states, pairs % env.n_states
+
+        indptr = np.zeros(env.n_states + 1, dtype=np.int64)
+        np.cumsum(np.bincount(targets, minlength=env.n_states), out=indptr[1:])
+        return indptr, sources
+
+    def policy_evaluation_step(self) -> float:
+        """
+        Perform up to `backups_per_step` prioritized backups.
+
+        On the first call, the residual of every state is computed with one
+        batched backup to seed the queue. Each batch of popped states is
+        backed up, then the residuals of their predecessors are recomputed
+        in one batch and those above `theta` are (re)queued. In reduced
+        precision, `theta` is raised to the `precision_floor`.
+
+        Returns
+        -------
+        float
+            The maximum value change (delta) during this step, 0.0 if the
+            queue is empty.
+        """
+        self._threshold = max(self.theta, self.precision_floor())
+        if self._queue is None:
+            self._seed_queue()
+
+        delta = 0.0
+        update_mask = self.update_mask
+        n_step_backups = 0
+        while n_step_backups < self.backups_per_step:
+            states = self._pop(min(self.batch_size, self.backups_per_step - n_step_backups))
+            if len(states) == 0:
+                break
+            # States may have become terminal or walls since they were queued
+            states = states[update_mask[states]]
+            if len(states) == 0:
+                continue
+
+            # Back up the states with the largest residuals
+            q_values = self.bellman.q_values_for(states, self.values, self.gamma)
+            new_values = np.max(q_values, axis=1)
+            changes = np.abs(new_values - self.values[states])
+            self.q_values[states] = q_values
+            self.values[states] = new_values
+            n_step_backups += len(states)
+            delta = max(delta, changes.max())
+
+            # Recompute the residuals of the predecessors that can still change
+            changed = states[changes > 0.0]
+            if len(changed) == 0:
+                continue
+            preds = np.unique(np.concatenate([
+                self.pred_states[self.pred_indptr[s]:self.pred_indptr[s + 1]] for s in changed
+            ]))
+            preds = preds[update_mask[preds]]
+            q_values = self.bellman.q_values_for(preds, self.values, self.gamma)
+            self.q_values[preds] = q_values
+            residuals = np.abs(np.max(q_values, axis=1) - self.values[preds])
+            queued = residuals > np.maximum(self._threshold, self._priority[preds])
+            for p, residual in zip(preds[queued], residuals[queued]):
+                self._push(p, residual)
+
+        self.n_backups += n_step_backups
+        return delta
+
+    def _seed_queue(self) -> None:
+        """
+        Push every state whose Bellman residual exceeds `theta`.
+
+        Returns
+        -------
+        None
+        """
+        self._queue = []
+        mask = self.update_mask
+        q_values = self.bellman.q_values(self.values, self.gamma)
+        self.q_values[mask] = q_values[mask]
+        residuals = np.where(mask, np.abs(np.max(q_values, axis=1) - self.values), 0.0)
+        for s in np.flatnonzero(residuals > self._threshold):
+            self._push(s, residuals[s])
+
+    def _push(self, state: int, residual: float) -> None:
+        """
+        Queue a state, or raise its priority if it is already queued.
+
+        Parameters
+        ----------
+        state : int
+            The state to queue.
+        residual : float
+            Its Bellman residual.
+
+        Returns
+        -------
+        None
+        """
+        if residual > self._threshold and residual > self._priority[state]:
+            self._priority[state] = residual
+            heapq.heappush(self._queue, (-residual, int(state)))
+
+    def _pop(self, n: int) -> np.ndarray:
+        """
+        Pop up to `n` queued states with the largest residuals.
+
+        Stale heap entries, left behind when a priority was raised, are
+        skipped.
+
+        Parameters
+        ----------
+        n : int
+            Maximum number of states to pop.
+
+        Returns
+        -------
+        np.ndarray
+            The popped states, empty if the queue is empty.
+        """
+        states = []
+        while self._queue and len(states) < n:
+            neg_residual, state = heapq.heappop(self._queue)
+            if -neg_residual == self._priority[state]:
+                self._priority[state] = 0.0
+                states.append(state)
+        return np.array(states, dtype=np.int64)
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of this algorithm.
+
+        Returns
+        -------
+        str
+            Name of the algorithm ("Prioritized Sweeping").
+        """
+        return "Prioritized Sweeping"
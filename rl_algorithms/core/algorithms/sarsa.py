@@ -0,0 +1,49 @@
+import numpy as np
+from rl_algorithms.core.algorithms.base import TemporalDifferenceLearning
+
+class SARSA(TemporalDifferenceLearning):
+    """
+    SARSA (on-policy temporal-difference control).
+
+    Inherits from TemporalDifferenceLearning. Each transition moves
+    Q(s, a) towards ``r + gamma * Q(s', a')``, where ``a'`` is the action
+    the epsilon-greedy behaviour policy actually takes next.
+    """
+
+    def td_update(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+                  next_states: np.ndarray, next_actions: np.ndarray, done: np.ndarray) -> None:
+        """
+        Apply the SARSA update to a batch of transitions in place.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The states of the batch.
+        actions : np.ndarray
+            The actions taken.
+        rewards : np.ndarray
+            The rewards received.
+        next_states : np.ndarray
+            The next states.
+        next_actions : np.ndarray
+            The actions the behaviour policy takes in the next states.
+        done : np.ndarray
+            Whether each next state is terminal.
+
+        Returns
+        -------
+        None
+        """
+        targets = rewards + self.gamma * ~done * self.q_values[next_states, next_actions]
+        self.apply_td_targets(states, actions, targets)
+
+    def __str__(self) -> str:
+        """
+        Return the string representation of the algorithm.
+
+        Returns
+        -------
+        str
+            Name of the algorithm ("SARSA").
+        """
+        return "SARSA"
@@ -14,42 +14,37 @@ class ValueIteration(GeneralizedPolicyIteration):
         """
         Perform a single value iteration step.
 
-        This method computes the Q-values for each state-action pair using the
-        Bellman optimality equation, then updates the state value to the maximum
-        Q-value over all actions. The maximum absolute difference (`delta`)
-        between old and updated values is returned as a convergence metric.
+        This method computes the whole Q table with one batched Bellman
+        optimality backup, then updates the state value to the maximum Q-value
+        over all actions. Terminal and wall states are masked out of the update.
+        With ``in_place=True`` the sweep is a Gauss-Seidel sweep in `sweep_order`.
+        The maximum absolute difference (`delta`) between old and updated
+        values is returned as a convergence metric.
 
         Returns
         -------
         float
             The maximum value change (delta) across all states during this iteration step.
         """
-        delta = 0
-        old_values = self.values.copy()
-
-        for s in range(self.env.n_states):
-            # Skip terminal and wall states
-            if s in self.env.terminal_states or s in self.env.walls:
-                continue
-
-            # Compute maximum Q-value across all actions
-            q_values = []
-            for a in self.env.actions:
-                q = 0
-                for s_prime in self.env.get_possible_successors(s, a):
-                    # Bellman optimality equation
-                    q += (self.env.transition_probs[s, a, s_prime] *
-                          (self.env.rewards[s_prime] + self.gamma * old_values[s_prime]))
-                q_values.append(q)
-
-            # Update Q-values and state value
-            self.q_values[s] = q_values
-            self.values[s] = max(q_values)
-
-            # Track maximum value change
-            delta = max(delta, np.abs(old_values[s] - self.values[s]))
-
-        return delta
+        return self.sweep()
+
+    def state_values(self, q_values: np.ndarray, states: np.ndarray = None) -> np.ndarray:
+        """
+        Maximum Q-value of each state over all actions.
+
+        Parameters
+        ----------
+        q_values : np.ndarray
+            Q-values of `states`, shaped (len(states), n_actions).
+        states : np.ndarray, optional
+            The states the Q-values belong to (default is all states).
+
+        Returns
+        -------
+        np.ndarray
+            The new value of each state.
+        """
+        return np.max(q_values, axis=1)
 
     def policy_improvement_step(self) -> bool:
         """
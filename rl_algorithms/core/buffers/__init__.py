@@ -0,0 +1,4 @@
+# rl_algorithms/core/buffers/__init__.py
+
+from .replay_buffer import ReplayBuffer, SpillColumn, SumTree, TRANSITION_DTYPE
+__all__ = ["ReplayBuffer", "SpillColumn", "SumTree", "TRANSITION_DTYPE"]
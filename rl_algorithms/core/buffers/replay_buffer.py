@@ -0,0 +1,554 @@
+import os
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+
+# One fixed-size column per field
+TRANSITION_DTYPE = np.dtype([
+    ('state', np.int32),
+    ('action', np.int8),
+    ('reward', np.float32),
+    ('next_state', np.int32),
+    ('done', bool),
+])
+
+
+class SumTree:
+    """
+    Binary tree of priority sums for proportional sampling.
+
+    Leaf ``i`` holds the priority of item ``i`` and every inner node the sum
+    of its children, so the root holds the total. Updates and samples touch
+    one node per level and are vectorized over batches of items.
+
+    Attributes
+    ----------
+    capacity : int
+        Number of leaves.
+    tree : np.ndarray
+        Nodes in heap order: node ``n`` has children ``2n`` and ``2n + 1``,
+        the root is node 1 and the leaves start at ``len(tree) // 2``.
+    """
+
+    def __init__(self, capacity: int, tree: np.ndarray = None):
+        """
+        Initialize a tree of zero priorities.
+
+        Parameters
+        ----------
+        capacity : int
+            Number of leaves.
+        tree : np.ndarray, optional
+            Zeroed float64 storage for the nodes, at least ``2 * P`` long
+            where ``P`` is `capacity` rounded up to a power of two (default
+            is a new in-memory array).
+        """
+        self.capacity = capacity
+        self._depth = max(0, int(capacity - 1).bit_length())
+        self._first_leaf = 1 << self._depth
+        self.tree = np.zeros(2 * self._first_leaf) if tree is None else tree
+
+    @property
+    def total(self) -> float:
+        """
+        Sum of all priorities.
+
+        Returns
+        -------
+        float
+            The root of the tree.
+        """
+        return float(self.tree[1])
+
+    def __getitem__(self, indices):
+        """
+        Priorities of items.
+
+        Parameters
+        ----------
+        indices : int or np.ndarray
+            Item indices.
+
+        Returns
+        -------
+        float or np.ndarray
+            Their priorities.
+        """
+        return self.tree[self._first_leaf + np.asarray(indices)]
+
+    def update(self, indices: np.ndarray, priorities: np.ndarray) -> None:
+        """
+        Set the priorities of items and refresh the sums above them.
+
+        Parameters
+        ----------
+        indices : np.ndarray
+            Item indices; for repeated indices the last priority wins.
+        priorities : np.ndarray
+            New priorities.
+
+        Returns
+        -------
+        None
+        """
+        nodes = self._first_leaf + np.asarray(indices, dtype=np.int64)
+        self.tree[nodes] = priorities
+        for _ in range(self._depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, targets: np.ndarray) -> np.ndarray:
+        """
+        Find the items whose cumulative priority range contains each target.
+
+        Parameters
+        ----------
+        targets : np.ndarray
+            Values in ``[0, total)``.
+
+        Returns
+        -------
+        np.ndarray
+            One item index per target.
+        """
+        targets = np.array(targets, dtype=np.float64)
+        nodes = np.ones(len(targets), dtype=np.int64)
+        for _ in range(self._depth):
+            left = self.tree[2 * nodes]
+            go_right = targets >= left
+            targets -= np.where(go_right, left, 0.0)
+            nodes = 2 * nodes + go_right
+        return nodes - self._first_leaf
+
+
+class SpillColumn:
+    """
+    One buffer column whose first rows live in RAM and the rest on disk.
+
+    Rows below `memory_rows` are stored in a regular array. Rows past it
+    are stored in a memory-mapped file, which is only created when the
+    first of them is written.
+
+    Attributes
+    ----------
+    memory : np.ndarray
+        The rows kept in RAM.
+    overflow : np.memmap or None
+        The spilled rows, None until one is written.
+    path : str or None
+        File of the spilled rows.
+    """
+
+    def __init__(self, length: int, memory_rows: int, dtype, path: str = None):
+        """
+        Allocate the in-memory part of the column.
+
+        Parameters
+        ----------
+        length : int
+            Number of rows.
+        memory_rows : int
+            Number of leading rows kept in RAM.
+        dtype : data-type
+            Data type of the column.
+        path : str, optional
+            File of the spilled rows, needed if `length` exceeds `memory_rows`.
+        """
+        self.memory = np.zeros(min(length, memory_rows), dtype=dtype)
+        self.overflow = None
+        self.path = path
+        self._overflow_rows = length - len(self.memory)
+
+    def __len__(self) -> int:
+        """
+        Number of rows.
+
+        Returns
+        -------
+        int
+            The column length.
+        """
+        return len(self.memory) + self._overflow_rows
+
+    def _spilled(self) -> np.memmap:
+        """
+        Get the spilled rows, creating their file on first use.
+
+        Returns
+        -------
+        np.memmap
+            The rows past `memory`.
+        """
+        if self.overflow is None:
+            self.overflow = np.memmap(self.path, dtype=self.memory.dtype, mode='w+',
+                                      shape=(self._overflow_rows,))
+        return self.overflow
+
+    def __getitem__(self, rows):
+        """
+        Read rows.
+
+        Parameters
+        ----------
+        rows : int or np.ndarray
+            Row indices.
+
+        Returns
+        -------
+        scalar or np.ndarray
+            The stored values.
+        """
+        if np.ndim(rows) == 0:
+            if rows < len(self.memory):
+                return self.memory[rows]
+            return self.memory.dtype.type(0) if self.overflow is None else \
+                self.overflow[rows - len(self.memory)]
+        rows = np.asarray(rows)
+        values = np.zeros(len(rows), dtype=self.memory.dtype)
+        low = rows < len(self.memory)
+        values[low] = self.memory[rows[low]]
+        if self.overflow is not None and not low.all():
+            values[~low] = self.overflow[rows[~low] - len(self.memory)]
+        return values
+
+    def __setitem__(self, rows, values) -> None:
+        """
+        Write a single row or a contiguous range of rows.
+
+        Parameters
+        ----------
+        rows : int or slice
+            A row index, or a slice without step.
+        values : scalar or np.ndarray
+            The values to store.
+        """
+        split = len(self.memory)
+        if not isinstance(rows, slice):
+            if rows < split:
+                self.memory[rows] = values
+            else:
+                self._spilled()[rows - split] = values
+            return
+        start, stop, _ = rows.indices(len(self))
+        if stop <= start:
+            return
+        values = np.broadcast_to(values, (stop - start,))
+        if start < split:
+            self.memory[start:min(stop, split)] = values[:split - start]
+        if stop > split:
+            low = max(start, split)
+            self._spilled()[low - split:stop - split] = values[low - start:]
+
+    def flush(self) -> None:
+        """
+        Write the spilled rows to their file.
+        """
+        if self.overflow is not None:
+            self.overflow.flush()
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity transition store with a structure-of-arrays layout.
+
+    Every field of `TRANSITION_DTYPE` is stored in its own contiguous column, so
+    appending writes one element per column and a sampled batch is one
+    gather per column. Once the buffer is full the oldest transitions are
+    overwritten.
+
+    The first `memory_limit` rows of every column are kept in RAM; the
+    rows past them spill to memory-mapped files, created when the first of
+    them is written. The files are sparse, so disk space is only used as
+    transitions are written, and the operating system pages them in and
+    out as sampling needs them. The priority tree of a prioritized buffer
+    cannot be split that way, so it is memory-mapped as a whole when the
+    capacity exceeds `memory_limit`.
+
+    With ``prioritized=True`` transitions are sampled in proportion to
+    ``priority ** alpha``; new transitions get the highest priority seen so
+    far, and `update_priorities` sets them from e.g. TD errors.
+
+    Attributes
+    ----------
+    capacity : int
+        Maximum number of transitions.
+    dtype : np.dtype
+        `TRANSITION_DTYPE`, whose fields name the columns.
+    columns : dict of str to SpillColumn
+        The column of each field, `capacity` long.
+    directory : str or None
+        Where the spilled rows live, or None if everything fits in RAM.
+    prioritized : bool
+        Whether sampling is proportional to priorities.
+    alpha : float
+        Priority exponent of prioritized sampling.
+    """
+
+    def __init__(self, capacity: int, memory_limit: int = 1_000_000, directory: str = None,
+                 prioritized: bool = False, alpha: float = 0.6, seed: int = 42):
+        """
+        Allocate the in-memory part of the columns.
+
+        Parameters
+        ----------
+        capacity : int
+            Maximum number of transitions.
+        memory_limit : int, optional
+            Number of transitions kept in RAM before spilling to disk
+            (default is 1,000,000).
+        directory : str, optional
+            Directory for the spilled rows (default is a new temporary
+            directory, removed by `close`).
+        prioritized : bool, optional
+            Sample in proportion to priorities (default is False).
+        alpha : float, optional
+            Priority exponent (default is 0.6).
+        seed : int, optional
+            Random seed for sampling (default is 42).
+
+        Raises
+        ------
+        ValueError
+            If `capacity` is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = int(capacity)
+        self.dtype = TRANSITION_DTYPE
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.rng = np.random.RandomState(seed)
+        self._next = 0
+        self._size = 0
+        self._max_priority = 1.0
+
+        self.directory = None
+        owned_directory = None
+        if self.capacity > memory_limit:
+            if directory is None:
+                directory = owned_directory = tempfile.mkdtemp(prefix='replay_buffer_')
+            else:
+                os.makedirs(directory, exist_ok=True)
+            self.directory = directory
+
+        self.columns = {name: SpillColumn(self.capacity, memory_limit, self.dtype[name],
+                                          self._path(name))
+                        for name in self.dtype.names}
+        self.priorities = None
+        if prioritized:
+            first_leaf = 1 << max(0, int(self.capacity - 1).bit_length())
+            if self.directory is None:
+                tree = np.zeros(2 * first_leaf)
+            else:
+                tree = np.memmap(self._path('priorities'), dtype=np.float64, mode='w+',
+                                 shape=(2 * first_leaf,))
+            self.priorities = SumTree(self.capacity, tree)
+
+        self._finalizer = weakref.finalize(self, ReplayBuffer._remove_directory, owned_directory)
+
+    def _path(self, name: str) -> str:
+        """
+        File of the spilled rows of a column.
+
+        Parameters
+        ----------
+        name : str
+            Name of the column.
+
+        Returns
+        -------
+        str or None
+            The file path, or None if nothing spills.
+        """
+        return None if self.directory is None else os.path.join(self.directory, f'{name}.dat')
+
+    def __len__(self) -> int:
+        """
+        Number of stored transitions.
+
+        Returns
+        -------
+        int
+            At most `capacity`.
+        """
+        return self._size
+
+    def append(self, state: int, action: int, reward: float, next_state: int, done: bool) -> int:
+        """
+        Store one transition.
+
+        Parameters
+        ----------
+        state : int
+            The state the action was taken in.
+        action : int
+            The action taken.
+        reward : float
+            The reward received.
+        next_state : int
+            The state reached.
+        done : bool
+            Whether `next_state` ends the episode.
+
+        Returns
+        -------
+        int
+            Index of the stored transition.
+        """
+        index = self._next
+        columns = self.columns
+        columns['state'][index] = state
+        columns['action'][index] = action
+        columns['reward'][index] = reward
+        columns['next_state'][index] = next_state
+        columns['done'][index] = done
+        if self.prioritized:
+            self.priorities.update(np.array([index]), self._max_priority ** self.alpha)
+        self._next = (index + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return index
+
+    def extend(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+               next_states: np.ndarray, dones: np.ndarray) -> np.ndarray:
+        """
+        Store a batch of transitions.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The states the actions were taken in.
+        actions : np.ndarray
+            The actions taken.
+        rewards : np.ndarray
+            The rewards received.
+        next_states : np.ndarray
+            The states reached.
+        dones : np.ndarray
+            Whether each next state ends its episode.
+
+        Returns
+        -------
+        np.ndarray
+            Indices of the stored transitions.
+        """
+        fields = {name: np.asarray(values) for name, values
+                  in zip(self.dtype.names, (states, actions, rewards, next_states, dones))}
+        n = len(states)
+        if n > self.capacity:
+            # Only the newest transitions survive
+            fields = {name: values[n - self.capacity:] for name, values in fields.items()}
+            n = self.capacity
+        indices = (self._next + np.arange(n)) % self.capacity
+        head = min(n, self.capacity - self._next)
+        for name, values in fields.items():
+            column = self.columns[name]
+            column[self._next:self._next + head] = values[:head]
+            column[:n - head] = values[head:]
+        if self.prioritized and n:
+            self.priorities.update(indices, np.full(n, self._max_priority ** self.alpha))
+        self._next = (self._next + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+        return indices
+
+    def sample(self, batch_size: int, beta: float = 0.4) -> dict:
+        """
+        Sample a batch of transitions.
+
+        Uniform sampling draws indices with replacement. Prioritized sampling
+        draws one index from each of `batch_size` equal slices of the total
+        priority.
+
+        Parameters
+        ----------
+        batch_size : int
+            Number of transitions.
+        beta : float, optional
+            Importance-sampling exponent of prioritized sampling (default is 0.4).
+
+        Returns
+        -------
+        dict
+            One array per column, plus ``'indices'``; prioritized
+            batches also hold ``'weights'``, the importance-sampling weights
+            normalized to a maximum of 1.
+
+        Raises
+        ------
+        ValueError
+            If the buffer is empty.
+        """
+        if self._size == 0:
+            raise ValueError("cannot sample from an empty replay buffer")
+        if self.prioritized:
+            total = self.priorities.total
+            targets = (np.arange(batch_size) + self.rng.rand(batch_size)) * (total / batch_size)
+            indices = self.priorities.find(np.minimum(targets, np.nextafter(total, 0)))
+            indices = np.minimum(indices, self._size - 1)
+        else:
+            indices = self.rng.randint(self._size, size=batch_size)
+        batch = {name: column[indices] for name, column in self.columns.items()}
+        batch['indices'] = indices
+        if self.prioritized:
+            probs = self.priorities[indices] / total
+            weights = (self._size * probs) ** -beta
+            batch['weights'] = weights / weights.max()
+        return batch
+
+    def update_priorities(self, indices: np.ndarray, priorities: np.ndarray) -> None:
+        """
+        Set the priorities of sampled transitions.
+
+        Parameters
+        ----------
+        indices : np.ndarray
+            Indices returned by `sample`.
+        priorities : np.ndarray
+            New positive priorities, e.g. absolute TD errors plus a small constant.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            If the buffer is not prioritized.
+        """
+        if not self.prioritized:
+            raise ValueError("update_priorities requires prioritized=True")
+        priorities = np.asarray(priorities, dtype=np.float64)
+        self._max_priority = max(self._max_priority, float(priorities.max(initial=0.0)))
+        self.priorities.update(indices, priorities ** self.alpha)
+
+    def close(self) -> None:
+        """
+        Release the columns and remove the temporary directory, if any.
+
+        Returns
+        -------
+        None
+        """
+        for column in self.columns.values():
+            column.flush()
+        self.columns = {}
+        self.priorities = None
+        self._finalizer()
+
+    @staticmethod
+    def _remove_directory(directory: str) -> None:
+        """
+        Remove a temporary column directory.
+
+        Parameters
+        ----------
+        directory : str or None
+            The directory, or None if there is nothing to remove.
+
+        Returns
+        -------
+        None
+        """
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
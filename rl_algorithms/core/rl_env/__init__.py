@@ -1,4 +1,7 @@
 # rl_algorithms/core/rl_env/__init__.py
 
 from .grid_world import GridWorld  # 또는 안에 있는 함수/클래스들
-__all__ = ["GridWorld"]
\ No newline at end of file
+from .transition_model import SparseTransitionModel
+from .vector_grid_world import VectorGridWorld
+from .trajectory import TrajectoryStore
+__all__ = ["GridWorld", "SparseTransitionModel", "VectorGridWorld", "TrajectoryStore"]
\ No newline at end of file
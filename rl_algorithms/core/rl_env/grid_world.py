@@ -1,4 +1,7 @@
+import weakref
 import numpy as np
+from rl_algorithms.core.rl_env.transition_model import SparseTransitionModel, index_dtype_for
+from rl_algorithms.core.rl_env.trajectory import TrajectoryStore
 
 class GridWorld:
     """
@@ -14,6 +17,16 @@ class GridWorld:
         The size of the grid (default is 7).
     seed : int, optional
         The random seed for reproducibility (default is 42).
+    build_model : bool, optional
+        Whether to build the tabular transition model (default is True).
+        Matrix-free solvers can skip it to keep memory at O(S).
+    main_transition_prob : float, optional
+        The probability of the agent taking the intended action (default is 0.8).
+    dtype : data-type, optional
+        Floating point type of the rewards and transition probabilities
+        (default is float64). Algorithms use the same type.
+    trace_capacity : int, optional
+        Number of recent agent states kept in `agent_trace` (default is 1024).
 
     Attributes
     ----------
@@ -25,8 +38,8 @@ class GridWorld:
         The initial state of the agent.
     agent_state : int
         The current state of the agent.
-    agent_trace : list of int
-        The trace of agent's past states.
+    agent_trace : TrajectoryStore
+        The agent's recent states since its last reset, most recent last.
     terminal_states : set of int
         The set of terminal states.
     walls : set of int
@@ -41,8 +54,22 @@ class GridWorld:
         The rewards for each state.
     main_transition_prob : float
         The probability of the agent taking the intended action.
-    transition_probs : ndarray of float
-        The transition probabilities for each state and action.
+    dtype : np.dtype
+        Floating point type of the rewards and transition probabilities.
+    move_table : ndarray of int
+        The deterministic next state for each state and action.
+    terminal_mask : ndarray of bool
+        Boolean mask of the terminal states.
+    wall_mask : ndarray of bool
+        Boolean mask of the wall states.
+    transition_probs : SparseTransitionModel or None
+        The sparse (CSR-style) transition probabilities for each state and action,
+        or None if the environment was built without a model.
+    successor_states : ndarray of int or None
+        Fixed-shape (S, A, K) table of successor states for each state and action.
+    successor_probs : ndarray of float or None
+        Fixed-shape (S, A, K) table of the matching transition probabilities.
+        Padding slots have a probability of zero.
 
     Methods
     -------
@@ -54,6 +81,26 @@ class GridWorld:
         Check if the agent has reached a terminal state.
     transition_w_perp(state, action)
         Perform a transition with perpendicular movement.
+    sample_next_states(states, actions, rng=None)
+        Perform `transition_w_perp` for a batch of states at once.
+    rollout(policy, n_steps=None, n_episodes=None, start_state=None, max_episode_steps=None)
+        Simulate whole trajectories under a policy in one call.
+    build_transition_model()
+        Build the sparse transition model of the grid.
+    build_move_table()
+        Compute the deterministic result of every action in every state.
+    distance_to_terminal()
+        Compute the number of moves from each state to the nearest terminal state.
+    set_wall(state, is_wall=True)
+        Add or remove a wall and update the affected transitions.
+    set_terminal(state, is_terminal=True)
+        Add or remove a terminal state.
+    set_penalty(state, is_penalty=True)
+        Add or remove a penalty state.
+    set_reward(state, reward)
+        Set the reward of a state.
+    add_observer(observer)
+        Notify an observer of model changes.
     get_possible_successors(state, action)
         Get all possible successor states for a given state and action.
     transition(state, action)
@@ -64,7 +111,8 @@ class GridWorld:
         Convert grid coordinates (row, column) to a state index.
     """
 
-    def __init__(self, size=7, seed=42):
+    def __init__(self, size=7, seed=42, build_model=True, main_transition_prob=0.8, dtype=np.float64,
+                 trace_capacity=1024):
         """
         Initialize the GridWorld environment.
 
@@ -74,14 +122,26 @@ class GridWorld:
             The size of the grid (default is 7).
         seed : int, optional
             The random seed for reproducibility (default is 42).
+        build_model : bool, optional
+            Whether to build the tabular transition model (default is True).
+        main_transition_prob : float, optional
+            The probability of the agent taking the intended action (default is 0.8).
+        dtype : data-type, optional
+            Floating point type of the rewards and transition probabilities
+            (default is float64).
+        trace_capacity : int, optional
+            Number of recent agent states kept in `agent_trace` (default is 1024).
         """
         self.rng = np.random.RandomState(seed)
+        self._observers = []
+        self.dtype = np.dtype(dtype)
         self.size = size
         self.n_states = size * size
 
         self.initial_state = self.index_to_state(0, 0)
         self.agent_state = self.initial_state
-        self.agent_trace = [None, self.agent_state]
+        self.agent_trace = TrajectoryStore(trace_capacity, dtype=index_dtype_for(self.n_states))
+        self.agent_trace.append(self.agent_state)
 
         self.terminal_states = {
             self.index_to_state(size - 1, size - 1),
@@ -101,20 +161,318 @@ class GridWorld:
         self.actions = [0, 1, 2, 3]
         self.action_symbols = ['↑', '→', '↓', '←']
 
-        self.rewards = np.zeros(self.n_states)
+        self.rewards = np.zeros(self.n_states, dtype=self.dtype)
         self.rewards[[ts for ts in self.terminal_states]] = 1.0
         self.rewards[[ps for ps in self.penalty_states]] = -1.0
 
-        self.main_transition_prob = 0.8
-        self.transition_probs = np.zeros((self.n_states, len(self.actions), self.n_states))
+        self.terminal_mask = np.zeros(self.n_states, dtype=bool)
+        self.terminal_mask[list(self.terminal_states)] = True
+        self.wall_mask = np.zeros(self.n_states, dtype=bool)
+        self.wall_mask[list(self.walls)] = True
+
+        self.main_transition_prob = float(main_transition_prob)
+        self.move_table = self.build_move_table()
+        if build_model:
+            self.transition_probs = self.build_transition_model()
+            self.successor_states, self.successor_probs = self.transition_probs.to_padded()
+        else:
+            self.transition_probs = None
+            self.successor_states, self.successor_probs = None, None
+
+    def build_transition_model(self):
+        """
+        Build the sparse transition model of the grid.
+
+        All successor states and probabilities are computed with whole-array
+        operations over the grid. The result matches `get_possible_successors`
+        entry by entry: the intended move gets `main_transition_prob`, and each
+        distinct perpendicular slip gets the remaining probability split in half.
+
+        Returns
+        -------
+        SparseTransitionModel
+            The transition probabilities for each state and action.
+        """
+        return SparseTransitionModel.from_padded(*self.successor_candidates())
+
+    def successor_candidates(self, states=None):
+        """
+        Compute the candidate successors of every action in some states.
+
+        Parameters
+        ----------
+        states : ndarray of int, optional
+            The states to compute (default is all states).
+
+        Returns
+        -------
+        tuple of ndarray
+            Candidate successor states, their probabilities, and which
+            candidates are kept, each shaped (len(states), A, 3). The kept
+            candidates of each row come first, in the order
+            `get_possible_successors` lists them.
+        """
+        move_table = self.move_table if states is None else self.move_table[states]
+        n_actions = len(self.actions)
+        actions = np.arange(n_actions)
+        main = move_table[:, actions]
+        perp1 = move_table[:, (actions + 1) % 4]
+        perp2 = move_table[:, (actions - 1) % 4]
+
+        next_states = np.stack([main, perp1, perp2], axis=-1)
+        # Successors are a set: drop slips landing on an already listed state
+        valid = np.stack([
+            np.ones_like(main, dtype=bool),
+            perp1 != main,
+            (perp2 != main) & (perp2 != perp1),
+        ], axis=-1)
+        probs = np.empty(next_states.shape, dtype=self.dtype)
+        probs[..., 0] = self.main_transition_prob
+        probs[..., 1:] = (1 - self.main_transition_prob) / 2
+        return next_states, probs, valid
+
+    def build_move_table(self, states=None):
+        """
+        Compute the deterministic result of every action in every state.
+
+        Parameters
+        ----------
+        states : ndarray of int, optional
+            Only compute the rows of these states (default is all states).
+
+        Returns
+        -------
+        ndarray of int, shape (n_states, 4)
+            ``move_table[s, a]`` equals ``transition(s, a)``; one row per
+            state of `states` if given.
+        """
+        index_dtype = index_dtype_for(self.n_states)
+        if states is None:
+            states = np.arange(self.n_states, dtype=index_dtype)
+        states = np.asarray(states).astype(index_dtype)
+        rows, cols = states // self.size, states % self.size
+
+        move_table = np.empty((len(states), len(self.actions)), dtype=index_dtype)
+        for a, (di, dj) in enumerate([(-1, 0), (0, 1), (1, 0), (0, -1)]):
+            i, j = rows + di, cols + dj
+            inside = (i >= 0) & (i < self.size) & (j >= 0) & (j < self.size)
+            next_states = np.where(inside, i * self.size + j, states)
+            # Bounce back from walls and borders
+            blocked = ~inside | self.wall_mask[next_states]
+            move_table[:, a] = np.where(blocked, states, next_states)
+        return move_table
+
+    def distance_to_terminal(self):
+        """
+        Compute the number of moves from each state to the nearest terminal state.
+
+        The distance is measured on the grid with walls, ignoring slips.
+
+        Returns
+        -------
+        ndarray of int
+            The distance of each state, or -1 for walls and states that
+            cannot reach a terminal state.
+        """
+        distance = np.full(self.n_states, -1, dtype=np.int64)
+        frontier = np.array(sorted(self.terminal_states), dtype=np.int64)
+        distance[frontier] = 0
+        level = 0
+        while len(frontier):
+            level += 1
+            # Free moves are symmetric, so the neighbors of the frontier are its predecessors
+            neighbors = np.unique(self.move_table[frontier])
+            frontier = neighbors[(distance[neighbors] < 0) & ~self.wall_mask[neighbors]]
+            distance[frontier] = level
+        return distance
+
+    def set_wall(self, state, is_wall=True):
+        """
+        Add or remove a wall and update the affected transitions.
+
+        Only the wall cell and its neighbors, whose moves may bounce off it,
+        have their `move_table` rows and transitions recomputed.
+
+        Parameters
+        ----------
+        state : int
+            The cell to change.
+        is_wall : bool, optional
+            Whether the cell becomes a wall (default is True).
+
+        Returns
+        -------
+        None
+        """
+        if is_wall:
+            self.walls.add(state)
+        else:
+            self.walls.discard(state)
+        self.wall_mask[state] = is_wall
+        i, j = self.state_to_index(state)
+        neighbors = [(i + di, j + dj) for di, dj in [(0, 0), (-1, 0), (0, 1), (1, 0), (0, -1)]]
+        self.update_transitions([self.index_to_state(ni, nj) for ni, nj in neighbors
+                                 if 0 <= ni < self.size and 0 <= nj < self.size])
+
+    def set_terminal(self, state, is_terminal=True):
+        """
+        Add or remove a terminal state.
+
+        Parameters
+        ----------
+        state : int
+            The cell to change.
+        is_terminal : bool, optional
+            Whether the cell becomes terminal (default is True).
+
+        Returns
+        -------
+        None
+        """
+        if is_terminal:
+            self.terminal_states.add(state)
+        else:
+            self.terminal_states.discard(state)
+        self.terminal_mask[state] = is_terminal
+        self.set_reward(state, self.default_reward(state))
+
+    def set_penalty(self, state, is_penalty=True):
+        """
+        Add or remove a penalty state.
+
+        Parameters
+        ----------
+        state : int
+            The cell to change.
+        is_penalty : bool, optional
+            Whether the cell becomes a penalty state (default is True).
+
+        Returns
+        -------
+        None
+        """
+        if is_penalty:
+            self.penalty_states.add(state)
+        else:
+            self.penalty_states.discard(state)
+        self.set_reward(state, self.default_reward(state))
+
+    def set_reward(self, state, reward):
+        """
+        Set the reward received when entering a state.
+
+        Parameters
+        ----------
+        state : int
+            The cell to change.
+        reward : float
+            Its new reward.
+
+        Returns
+        -------
+        None
+        """
+        self.rewards[state] = reward
+        self.notify_observers('model_changed', {'states': np.array([state])})
 
-        for s in range(self.n_states):
-            for a in self.actions:
-                for s_prime in self.get_possible_successors(s, a):
-                    if s_prime == self.transition(s, a):
-                        self.transition_probs[s, a, s_prime] = self.main_transition_prob
-                    else:
-                        self.transition_probs[s, a, s_prime] = (1 - self.main_transition_prob) / 2
+    def default_reward(self, state):
+        """
+        Get the reward a state has by its kind.
+
+        Parameters
+        ----------
+        state : int
+            The state.
+
+        Returns
+        -------
+        float
+            -1.0 for penalty states, 1.0 for terminal states, 0.0 otherwise.
+        """
+        if state in self.penalty_states:
+            return -1.0
+        return 1.0 if state in self.terminal_states else 0.0
+
+    def update_transitions(self, states):
+        """
+        Recompute the moves and transitions of some states.
+
+        The rows of `move_table`, of the sparse transition model and of the
+        padded successor tables are replaced for `states` only, then the
+        observers are told these states changed.
+
+        Parameters
+        ----------
+        states : iterable of int
+            The states whose dynamics changed.
+
+        Returns
+        -------
+        None
+        """
+        states = np.unique(np.asarray(list(states), dtype=np.int64))
+        self.move_table[states] = self.build_move_table(states)
+        if self.transition_probs is not None:
+            self.transition_probs.replace_states(states, *self.successor_candidates(states))
+            width = self.successor_states.shape[2]
+            self.successor_states[states], self.successor_probs[states] = \
+                self.transition_probs.to_padded(width, states)
+        self.notify_observers('model_changed', {'states': states})
+
+    def add_observer(self, observer):
+        """
+        Notify an observer of model changes.
+
+        Observers are held by weak references and receive
+        ``update('model_changed', {'states': states})`` with the states whose
+        reward, kind or transitions changed.
+
+        Parameters
+        ----------
+        observer : object
+            Any object with an ``update(event_type, data)`` method.
+
+        Returns
+        -------
+        None
+        """
+        self._observers.append(weakref.ref(observer))
+
+    def remove_observer(self, observer):
+        """
+        Stop notifying an observer.
+
+        Parameters
+        ----------
+        observer : object
+            A previously added observer.
+
+        Returns
+        -------
+        None
+        """
+        self._observers = [ref for ref in self._observers if ref() not in (None, observer)]
+
+    def notify_observers(self, event_type, data=None):
+        """
+        Notify all live observers of an event.
+
+        Parameters
+        ----------
+        event_type : str
+            The type of the event (e.g., 'model_changed').
+        data : dict, optional
+            Additional data associated with the event (default is None).
+
+        Returns
+        -------
+        None
+        """
+        self._observers = [ref for ref in self._observers if ref() is not None]
+        for ref in list(self._observers):
+            observer = ref()
+            if observer is not None:
+                observer.update(event_type, data)
 
     def move_agent(self, action):
         """
@@ -139,7 +497,8 @@ class GridWorld:
         Reset the agent to its initial state.
         """
         self.agent_state = self.initial_state
-        self.agent_trace = [None, self.agent_state]
+        self.agent_trace.clear()
+        self.agent_trace.append(self.agent_state)
 
     def is_terminated(self):
         """
@@ -174,6 +533,239 @@ class GridWorld:
             action = self.rng.choice([perp_action1, perp_action2])
         return self.transition(state, action)
 
+    def sample_next_states(self, states, actions, rng=None):
+        """
+        Perform `transition_w_perp` for a batch of states at once.
+
+        One uniform number per state decides both whether the agent slips
+        and to which side.
+
+        Parameters
+        ----------
+        states : ndarray of int
+            The current states.
+        actions : ndarray of int
+            The action taken in each state.
+        rng : np.random.RandomState, optional
+            Source of the slip noise (default is the environment's `rng`).
+
+        Returns
+        -------
+        ndarray of int
+            The resulting state of each transition.
+        """
+        rng = self.rng if rng is None else rng
+        noise = rng.rand(len(states))
+        p = self.main_transition_prob
+        turn = np.where(noise > p, np.where(noise > (1 + p) / 2, -1, 1), 0)
+        return self.move_table[states, (actions + turn) % 4]
+
+    def rollout(self, policy, n_steps=None, n_episodes=None, start_state=None,
+                max_episode_steps=None, block_size=4096):
+        """
+        Simulate whole trajectories under a policy in one call.
+
+        Follows the dynamics of `transition_w_perp`, but the slip noise is
+        drawn from `rng` in blocks of `block_size` steps and the moves are
+        looked up in `move_table`. Episodes start at `start_state` and end on
+        a terminal state or after `max_episode_steps` steps; the next one
+        starts right away until a budget runs out. The agent (`agent_state`
+        and `agent_trace`) is left untouched.
+
+        When only `n_episodes` is given and it is above 1, the episodes are
+        instead stepped together with `sample_next_states`, one batch of
+        the still running episodes per step. The steps are returned in the
+        same episode-by-episode order, but the random numbers are consumed
+        differently, so the trajectories differ from the sequential ones
+        drawn with the same seed.
+
+        Parameters
+        ----------
+        policy : ndarray or callable
+            One action per state (negative entries act uniformly at random),
+            action probabilities shaped (n_states, n_actions), or a function
+            mapping a state to an action.
+        n_steps : int, optional
+            Maximum total number of steps.
+        n_episodes : int, optional
+            Maximum number of episodes.
+        start_state : int, optional
+            The state each episode starts in (default is `initial_state`).
+        max_episode_steps : int, optional
+            Episodes are cut after this many steps (default is no limit).
+        block_size : int, optional
+            Number of steps of random numbers drawn at once (default is 4096).
+
+        Returns
+        -------
+        dict
+            ``'states'``, ``'actions'``, ``'rewards'``, ``'next_states'`` and
+            ``'dones'`` (reached a terminal state) with one entry per step,
+            and ``'episode_lengths'`` with one entry per finished or cut episode.
+
+        Raises
+        ------
+        ValueError
+            If neither `n_steps` nor `n_episodes` is given.
+        """
+        if n_steps is None and n_episodes is None:
+            raise ValueError("rollout needs n_steps or n_episodes")
+        step_budget = n_steps is not None
+        n_steps = np.inf if n_steps is None else n_steps
+        n_episodes = np.inf if n_episodes is None else n_episodes
+        max_episode_steps = max_episode_steps or np.inf
+        start_state = self.initial_state if start_state is None else int(start_state)
+
+        if not step_budget and n_episodes > 1:
+            return self._rollout_batch(policy, n_episodes, start_state, max_episode_steps)
+
+        n_actions = len(self.actions)
+        select = policy if callable(policy) else None
+        table = probs = None
+        if select is None:
+            policy = np.asarray(policy)
+            if policy.ndim == 2:
+                probs = np.cumsum(policy, axis=1).tolist()
+            else:
+                table = policy.astype(np.int64).tolist()
+
+        moves = self.move_table.tolist()
+        terminal = self.terminal_mask.tolist()
+        slip_threshold = self.main_transition_prob
+
+        states, actions, next_states, episode_lengths = [], [], [], []
+        state, length, step = start_state, 0, 0
+        while step < n_steps and len(episode_lengths) < n_episodes:
+            block = int(min(block_size, n_steps - step)) if n_steps < np.inf else block_size
+            # slip, slip side and action sampling noise of each step
+            noise = self.rng.rand(block, 3).tolist()
+            for slip, side, pick in noise:
+                if select is not None:
+                    action = int(select(state))
+                elif probs is not None:
+                    cdf = probs[state]
+                    action = next((a for a in range(n_actions - 1) if pick * cdf[-1] < cdf[a]),
+                                  n_actions - 1)
+                else:
+                    action = table[state]
+                    if action < 0:
+                        action = min(int(pick * n_actions), n_actions - 1)
+                states.append(state)
+                actions.append(action)
+                if slip > slip_threshold:
+                    action = (action + 1) % 4 if side < 0.5 else (action - 1) % 4
+                state = moves[state][action]
+                next_states.append(state)
+                length += 1
+                step += 1
+                if terminal[state] or length >= max_episode_steps:
+                    episode_lengths.append(length)
+                    state, length = start_state, 0
+                    if len(episode_lengths) >= n_episodes:
+                        break
+                if step >= n_steps:
+                    break
+        if length:
+            episode_lengths.append(length)
+
+        index_dtype = index_dtype_for(self.n_states)
+        states = np.array(states, dtype=index_dtype)
+        actions = np.array(actions, dtype=np.int8)
+        next_states = np.array(next_states, dtype=index_dtype)
+        return self._rollout_result(states, actions, next_states, episode_lengths)
+
+    def _rollout_batch(self, policy, n_episodes, start_state, max_episode_steps):
+        """
+        Simulate `n_episodes` episodes in lockstep for `rollout`.
+
+        Parameters
+        ----------
+        policy : ndarray or callable
+            The policy, as accepted by `rollout`.
+        n_episodes : int
+            Number of episodes.
+        start_state : int
+            The state each episode starts in.
+        max_episode_steps : int or float
+            Episode length limit, or infinity.
+
+        Returns
+        -------
+        dict
+            The trajectories, as returned by `rollout`.
+        """
+        n_actions = len(self.actions)
+        if not callable(policy):
+            policy = np.asarray(policy)
+            if policy.ndim == 2:
+                cdf = np.cumsum(policy, axis=1)
+            else:
+                table = policy.astype(np.int64)
+
+        index_dtype = index_dtype_for(self.n_states)
+        episodes = np.arange(int(n_episodes))
+        state = np.full(len(episodes), start_state, dtype=index_dtype)
+        episode_lengths = np.zeros(len(episodes), dtype=np.int64)
+        steps = []
+        length = 0
+        while len(episodes):
+            if callable(policy):
+                action = np.array([policy(s) for s in state.tolist()], dtype=np.int64)
+            elif policy.ndim == 2:
+                rows = cdf[state]
+                pick = self.rng.rand(len(state)) * rows[:, -1]
+                action = np.count_nonzero(rows[:, :-1] <= pick[:, None], axis=1)
+            else:
+                action = table[state]
+                uniform = action < 0
+                if uniform.any():
+                    action[uniform] = self.rng.randint(n_actions, size=int(uniform.sum()))
+            next_state = self.sample_next_states(state, action)
+            steps.append((episodes, state, action, next_state))
+            length += 1
+
+            running = ~self.terminal_mask[next_state]
+            if length >= max_episode_steps:
+                running[:] = False
+            episode_lengths[episodes[~running]] = length
+            episodes, state = episodes[running], next_state[running]
+
+        # Steps were recorded step by step; a stable sort groups them by episode
+        order = np.argsort(np.concatenate([step[0] for step in steps]), kind='stable')
+        states, actions, next_states = (np.concatenate([step[i] for step in steps])[order]
+                                        for i in (1, 2, 3))
+        return self._rollout_result(states, actions.astype(np.int8), next_states,
+                                    episode_lengths)
+
+    def _rollout_result(self, states, actions, next_states, episode_lengths):
+        """
+        Pack simulated steps into the dictionary `rollout` returns.
+
+        Parameters
+        ----------
+        states : ndarray of int
+            The state of each step.
+        actions : ndarray of int
+            The action of each step.
+        next_states : ndarray of int
+            The state reached by each step.
+        episode_lengths : sequence of int
+            The length of each episode.
+
+        Returns
+        -------
+        dict
+            The trajectories, as returned by `rollout`.
+        """
+        return {
+            'states': states,
+            'actions': actions,
+            'rewards': self.rewards[next_states],
+            'next_states': next_states,
+            'dones': self.terminal_mask[next_states],
+            'episode_lengths': np.array(episode_lengths, dtype=np.int64),
+        }
+
     def get_possible_successors(self, state: int, action: int) -> list:
         """
         Get all possible successor states for a given state and action.
@@ -188,15 +780,17 @@ class GridWorld:
         Returns
         -------
         list of int
-            The list of possible successor states.
+            The distinct possible successor states: the intended move
+            first, then the slips to either side.
         """
-        successors = set()
-        successors.add(self.transition(state, action))
         perp_action1 = (action + 1) % 4
         perp_action2 = (action - 1) % 4
-        successors.add(self.transition(state, perp_action1))
-        successors.add(self.transition(state, perp_action2))
-        return list(successors)
+        # Distinct states in a fixed order: the intended move, then both slips
+        return list(dict.fromkeys([
+            self.transition(state, action),
+            self.transition(state, perp_action1),
+            self.transition(state, perp_action2),
+        ]))
 
     def transition(self, state: int, action: int) -> int:
         """
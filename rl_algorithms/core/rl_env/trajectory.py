@@ -0,0 +1,148 @@
+import numpy as np
+
+
+class TrajectoryStore:
+    """
+    Array-backed store of the states an agent visited.
+
+    In ring-buffer mode the store keeps the last `capacity` states and
+    overwrites the oldest one on every append. Otherwise it keeps every
+    state and doubles its array when full, so appends stay amortized O(1).
+    Recent states are read by negative index or with `last` without
+    copying the history.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Number of states kept in ring-buffer mode, or the initial size of
+        the array otherwise (default is 1024).
+    dtype : data-type, optional
+        Integer type of the stored states (default is int64).
+    ring : bool, optional
+        Whether to keep only the last `capacity` states (default is True).
+
+    Attributes
+    ----------
+    capacity : int
+        Current size of the array.
+    ring : bool
+        Whether the store is a ring buffer.
+    total : int
+        Number of states appended since the last `clear`, including the
+        ones overwritten in ring-buffer mode.
+    """
+
+    def __init__(self, capacity=1024, dtype=np.int64, ring=True):
+        """
+        Allocate an empty store.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Number of states kept in ring-buffer mode, or the initial size
+            of the array otherwise (default is 1024).
+        dtype : data-type, optional
+            Integer type of the stored states (default is int64).
+        ring : bool, optional
+            Whether to keep only the last `capacity` states (default is True).
+
+        Raises
+        ------
+        ValueError
+            If `capacity` is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = int(capacity)
+        self.ring = ring
+        self._states = np.zeros(self.capacity, dtype=dtype)
+        self.total = 0
+
+    def __len__(self):
+        """
+        Number of states that can be read back.
+
+        Returns
+        -------
+        int
+            `total`, capped at `capacity` in ring-buffer mode.
+        """
+        return min(self.total, self.capacity)
+
+    def __getitem__(self, index):
+        """
+        Read one stored state.
+
+        Parameters
+        ----------
+        index : int
+            Position in the readable history; negative indices count from
+            the most recent state.
+
+        Returns
+        -------
+        int
+            The state.
+
+        Raises
+        ------
+        IndexError
+            If the index is out of range.
+        """
+        size = len(self)
+        if not -size <= index < size:
+            raise IndexError(f"trajectory index {index} out of range for {size} states")
+        if index < 0:
+            index += size
+        return int(self._states[(self.total - size + index) % self.capacity])
+
+    def append(self, state):
+        """
+        Add the most recent state.
+
+        Parameters
+        ----------
+        state : int
+            The state.
+        """
+        if not self.ring and self.total == self.capacity:
+            self._states = np.concatenate([self._states, np.zeros_like(self._states)])
+            self.capacity *= 2
+        self._states[self.total % self.capacity] = state
+        self.total += 1
+
+    def last(self, k=1):
+        """
+        Get the most recent states.
+
+        Parameters
+        ----------
+        k : int, optional
+            Number of states (default is 1); fewer are returned if fewer
+            are stored.
+
+        Returns
+        -------
+        ndarray of int
+            Up to `k` states, oldest first.
+        """
+        k = min(k, len(self))
+        positions = np.arange(self.total - k, self.total) % self.capacity
+        return self._states[positions]
+
+    def to_array(self):
+        """
+        Export the readable history.
+
+        Returns
+        -------
+        ndarray of int
+            A copy of every readable state, oldest first.
+        """
+        return self.last(len(self)).copy()
+
+    def clear(self):
+        """
+        Forget every stored state, keeping the allocated array.
+        """
+        self.total = 0
@@ -0,0 +1,322 @@
+import numpy as np
+
+
+class SparseTransitionModel:
+    """
+    Sparse (CSR-style) storage of a tabular transition model P(s' | s, a).
+
+    Every (state, action) pair owns one row. The successors of row
+    ``r = state * n_actions + action`` are ``indices[indptr[r]:indptr[r + 1]]``
+    with the matching probabilities in ``probs``. Memory grows with the number
+    of non-zero transitions instead of ``n_states ** 2``.
+
+    Parameters
+    ----------
+    n_states : int
+        Number of states.
+    n_actions : int
+        Number of actions.
+    indptr : ndarray of int
+        Row pointer array of length ``n_states * n_actions + 1``.
+    indices : ndarray of int
+        Successor state indices.
+    probs : ndarray of float
+        Transition probabilities matching `indices`.
+
+    Attributes
+    ----------
+    n_states : int
+        Number of states.
+    n_actions : int
+        Number of actions.
+    indptr : ndarray of int
+        Row pointer array.
+    indices : ndarray of int
+        Successor state indices.
+    probs : ndarray of float
+        Transition probabilities.
+    """
+
+    def __init__(self, n_states, n_actions, indptr, indices, probs):
+        """
+        Initialize the transition model from CSR arrays.
+
+        Parameters
+        ----------
+        n_states : int
+            Number of states.
+        n_actions : int
+            Number of actions.
+        indptr : ndarray of int
+            Row pointer array of length ``n_states * n_actions + 1``.
+        indices : ndarray of int
+            Successor state indices.
+        probs : ndarray of float
+            Transition probabilities matching `indices`.
+        """
+        if len(indptr) != n_states * n_actions + 1:
+            raise ValueError("indptr must have n_states * n_actions + 1 entries")
+        if len(indices) != len(probs):
+            raise ValueError("indices and probs must have the same length")
+        self.n_states = n_states
+        self.n_actions = n_actions
+        self.indptr = np.asarray(indptr)
+        self.indices = np.asarray(indices)
+        self.probs = np.asarray(probs)
+
+    @classmethod
+    def from_padded(cls, next_states, probs, valid):
+        """
+        Build a transition model from fixed-width successor arrays.
+
+        Parameters
+        ----------
+        next_states : ndarray of int, shape (S, A, K)
+            Candidate successor states of every (state, action) pair.
+        probs : ndarray of float, shape (S, A, K)
+            Probabilities matching `next_states`.
+        valid : ndarray of bool, shape (S, A, K)
+            Which candidates are stored; the others are dropped.
+
+        Returns
+        -------
+        SparseTransitionModel
+            The assembled model, keeping the order of the candidates within
+            each row.
+        """
+        n_states, n_actions, _ = next_states.shape
+        lengths, indices, probs = cls._packed_rows(n_states, next_states, probs, valid)
+
+        indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        return cls(n_states, n_actions, indptr, indices, probs)
+
+    @staticmethod
+    def _packed_rows(n_states, next_states, probs, valid) -> tuple:
+        """
+        Pack fixed-width successor candidates into CSR rows.
+
+        Parameters
+        ----------
+        n_states : int
+            Number of states of the model.
+        next_states : ndarray of int, shape (..., K)
+            Candidate successor states of each row.
+        probs : ndarray of float, shape (..., K)
+            Probabilities matching `next_states`.
+        valid : ndarray of bool, shape (..., K)
+            Which candidates are stored.
+
+        Returns
+        -------
+        tuple of ndarray
+            The length of each row, and the concatenated successor indices
+            and probabilities, in candidate order.
+        """
+        width = next_states.shape[-1]
+        valid = valid.reshape(-1, width)
+        indices = next_states.reshape(valid.shape)[valid].astype(index_dtype_for(n_states))
+        return valid.sum(axis=1), indices, probs.reshape(valid.shape)[valid]
+
+    def replace_states(self, states, next_states, probs, valid) -> None:
+        """
+        Replace the rows of some states, leaving the other rows untouched.
+
+        The new rows are spliced into the CSR arrays between the unchanged
+        segments, so the cost is a copy of the arrays, without recomputing
+        any other transition.
+
+        Parameters
+        ----------
+        states : ndarray of int, shape (n,)
+            Distinct states whose rows are replaced, in increasing order.
+        next_states : ndarray of int, shape (n, A, K)
+            Candidate successor states of every action of `states`.
+        probs : ndarray of float, shape (n, A, K)
+            Probabilities matching `next_states`.
+        valid : ndarray of bool, shape (n, A, K)
+            Which candidates are stored.
+
+        Returns
+        -------
+        None
+        """
+        lengths, new_indices, new_probs = self._packed_rows(self.n_states, next_states, probs, valid)
+        new_indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=new_indptr[1:])
+
+        # Alternate unchanged segments and replaced states
+        indices, values = [], []
+        previous = 0
+        for i, state in enumerate(states):
+            start, end = self.indptr[previous], self.indptr[state * self.n_actions]
+            indices += [self.indices[start:end], new_indices[new_indptr[i * self.n_actions]:
+                                                             new_indptr[(i + 1) * self.n_actions]]]
+            values += [self.probs[start:end], new_probs[new_indptr[i * self.n_actions]:
+                                                        new_indptr[(i + 1) * self.n_actions]]]
+            previous = (state + 1) * self.n_actions
+        indices.append(self.indices[self.indptr[previous]:])
+        values.append(self.probs[self.indptr[previous]:])
+
+        row_lengths = np.diff(self.indptr)
+        rows = (np.asarray(states)[:, None] * self.n_actions + np.arange(self.n_actions)).ravel()
+        row_lengths[rows] = lengths
+        np.cumsum(row_lengths, out=self.indptr[1:])
+        self.indices = np.concatenate(indices)
+        self.probs = np.concatenate(values)
+
+    @property
+    def shape(self) -> tuple:
+        """
+        Shape of the equivalent dense tensor.
+
+        Returns
+        -------
+        tuple of int
+            ``(n_states, n_actions, n_states)``.
+        """
+        return self.n_states, self.n_actions, self.n_states
+
+    @property
+    def nnz(self) -> int:
+        """
+        Number of stored transitions.
+
+        Returns
+        -------
+        int
+            Number of non-zero entries.
+        """
+        return len(self.indices)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory used by the CSR arrays.
+
+        Returns
+        -------
+        int
+            Total size of the arrays in bytes.
+        """
+        return self.indptr.nbytes + self.indices.nbytes + self.probs.nbytes
+
+    def row(self, state: int, action: int) -> tuple:
+        """
+        Get the successors of a (state, action) pair.
+
+        Parameters
+        ----------
+        state : int
+            The current state.
+        action : int
+            The action to take.
+
+        Returns
+        -------
+        tuple of ndarray
+            Successor state indices and their probabilities (views, not copies).
+        """
+        r = state * self.n_actions + action
+        start, end = self.indptr[r], self.indptr[r + 1]
+        return self.indices[start:end], self.probs[start:end]
+
+    def to_padded(self, width: int = None, states: np.ndarray = None) -> tuple:
+        """
+        Convert the model into fixed-width successor tables.
+
+        Rows with fewer than `width` successors are padded with the row's own
+        state and a probability of zero, so the tables can be used directly
+        in vectorized Bellman backups.
+
+        Parameters
+        ----------
+        width : int, optional
+            Number of successor slots K per (state, action) pair (default is
+            the longest row).
+        states : ndarray of int, optional
+            Only convert the rows of these states (default is all states).
+
+        Returns
+        -------
+        tuple of ndarray
+            Successor states and probabilities, both shaped (S, A, K), or
+            (len(states), A, K) if `states` is given.
+        """
+        if states is None:
+            states = np.arange(self.n_states)
+        states = np.asarray(states)
+        row_ids = (states[:, None] * self.n_actions + np.arange(self.n_actions)).ravel()
+        row_lengths = self.indptr[row_ids + 1] - self.indptr[row_ids]
+        if width is None:
+            width = int(row_lengths.max()) if len(row_lengths) else 0
+        elif len(row_lengths) and width < row_lengths.max():
+            raise ValueError("width is smaller than the longest successor row")
+
+        n_rows = len(row_ids)
+        rows = np.repeat(np.arange(n_rows), row_lengths)
+        starts = np.cumsum(row_lengths) - row_lengths
+        slots = np.arange(len(rows)) - np.repeat(starts, row_lengths)
+        entries = slots + np.repeat(self.indptr[row_ids], row_lengths)
+
+        owners = np.repeat(states.astype(self.indices.dtype), self.n_actions)
+        next_states = np.repeat(owners[:, None], width, axis=1)
+        probs = np.zeros((n_rows, width), dtype=self.probs.dtype)
+        next_states[rows, slots] = self.indices[entries]
+        probs[rows, slots] = self.probs[entries]
+
+        shape = (len(states), self.n_actions, width)
+        return next_states.reshape(shape), probs.reshape(shape)
+
+    def __getitem__(self, key) -> float:
+        """
+        Look up a single transition probability.
+
+        Parameters
+        ----------
+        key : tuple of int
+            ``(state, action, next_state)``.
+
+        Returns
+        -------
+        float
+            P(next_state | state, action), 0.0 if not stored.
+        """
+        state, action, s_prime = key
+        indices, probs = self.row(state, action)
+        # Rows are short and not sorted: scan them
+        match = np.flatnonzero(indices == s_prime)
+        return probs[match[0]] if len(match) else 0.0
+
+    def toarray(self) -> np.ndarray:
+        """
+        Expand the model into a dense ``(S, A, S)`` tensor.
+
+        Only meant for small grids and debugging.
+
+        Returns
+        -------
+        ndarray of float
+            The dense transition tensor.
+        """
+        dense = np.zeros(self.shape, dtype=self.probs.dtype)
+        rows = np.repeat(np.arange(self.n_states * self.n_actions), np.diff(self.indptr))
+        dense.reshape(-1, self.n_states)[rows, self.indices] = self.probs
+        return dense
+
+
+def index_dtype_for(n_states: int):
+    """
+    Pick the smallest integer dtype able to index `n_states` states.
+
+    Parameters
+    ----------
+    n_states : int
+        Number of states.
+
+    Returns
+    -------
+    numpy.dtype
+        ``int32`` when it fits, ``int64`` otherwise.
+    """
+    return np.dtype(np.int32) if n_states < np.iinfo(np.int32).max else np.dtype(np.int64)
@@ -0,0 +1,139 @@
+import numpy as np
+from rl_algorithms.core.rl_env.transition_model import index_dtype_for
+
+
+class VectorGridWorld:
+    """
+    N independent agents stepping through one GridWorld in lockstep.
+
+    The agents share the grid, its `move_table` and rewards, but each one
+    has its own state, its own slip noise and its own episode. A step moves
+    every agent at once with `GridWorld.sample_next_states`; agents that
+    reach a terminal state or run out of steps are sent back to the start
+    state automatically. A step may also move only some of the agents, so
+    a batch of single episodes can drop the agents that are done.
+
+    Parameters
+    ----------
+    env : GridWorld
+        The grid the agents move in. Changes to it are seen by the agents.
+    n_envs : int
+        Number of agents.
+    seed : int, optional
+        The random seed of the slip noise (default is 42).
+    start_state : int or array_like of int, optional
+        The state every episode starts in, or one start state per agent
+        (default is `env.initial_state`).
+    max_episode_steps : int, optional
+        Episodes are cut after this many steps (default is no limit).
+
+    Attributes
+    ----------
+    env : GridWorld
+        The grid the agents move in.
+    n_envs : int
+        Number of agents.
+    rng : np.random.RandomState
+        Random number generator of the slip noise.
+    start_state : int or ndarray of int
+        The state every episode starts in, or one per agent.
+    max_episode_steps : int or None
+        Episode length limit.
+    agent_states : ndarray of int
+        The current state of each agent.
+    episode_steps : ndarray of int
+        Number of steps each agent took in its current episode.
+    total_steps : int
+        Number of agent steps taken since the last reset.
+    total_episodes : int
+        Number of episodes finished or cut since the last reset.
+    """
+
+    def __init__(self, env, n_envs, seed=42, start_state=None, max_episode_steps=None):
+        """
+        Initialize the agents at the start state.
+
+        Parameters
+        ----------
+        env : GridWorld
+            The grid the agents move in.
+        n_envs : int
+            Number of agents.
+        seed : int, optional
+            The random seed of the slip noise (default is 42).
+        start_state : int or array_like of int, optional
+            The state every episode starts in, or one start state per agent
+            (default is `env.initial_state`).
+        max_episode_steps : int, optional
+            Episodes are cut after this many steps (default is no limit).
+        """
+        self.env = env
+        self.n_envs = n_envs
+        self.rng = np.random.RandomState(seed)
+        self.start_state = env.initial_state if start_state is None else start_state
+        self._start_states = np.broadcast_to(
+            np.asarray(self.start_state, dtype=index_dtype_for(env.n_states)), (n_envs,))
+        self.max_episode_steps = max_episode_steps
+        self.reset()
+
+    def reset(self):
+        """
+        Send every agent back to the start state.
+
+        Returns
+        -------
+        ndarray of int
+            The agents' states.
+        """
+        self.agent_states = self._start_states.copy()
+        self.episode_steps = np.zeros(self.n_envs, dtype=np.int64)
+        self.total_steps = 0
+        self.total_episodes = 0
+        return self.agent_states.copy()
+
+    def step(self, actions, agents=None):
+        """
+        Move every agent, or the given agents, by one action.
+
+        Agents whose episode ended start a new one: their entry of
+        `agent_states` is the start state again, while the returned
+        `next_states` still hold the state they reached.
+
+        Parameters
+        ----------
+        actions : ndarray of int
+            The action of each moved agent.
+        agents : ndarray of int, optional
+            Indices of the agents to move (default is all of them); the
+            others stay where they are.
+
+        Returns
+        -------
+        next_states : ndarray of int
+            The state each moved agent reached.
+        rewards : ndarray of float
+            The reward each moved agent received.
+        dones : ndarray of bool
+            Whether each moved agent reached a terminal state.
+        truncated : ndarray of bool
+            Whether each moved agent's episode was cut by `max_episode_steps`.
+        """
+        env = self.env
+        agents = np.arange(self.n_envs) if agents is None else np.asarray(agents)
+        next_states = env.sample_next_states(self.agent_states[agents], actions, self.rng)
+        rewards = env.rewards[next_states]
+        dones = env.terminal_mask[next_states]
+
+        self.episode_steps[agents] += 1
+        if self.max_episode_steps is None:
+            truncated = np.zeros(len(agents), dtype=bool)
+        else:
+            truncated = ~dones & (self.episode_steps[agents] >= self.max_episode_steps)
+        ended = agents[dones | truncated]
+
+        self.agent_states[agents] = next_states
+        self.agent_states[ended] = self._start_states[ended]
+        self.episode_steps[ended] = 0
+        self.total_steps += len(agents)
+        self.total_episodes += len(ended)
+        return next_states, rewards, dones, truncated
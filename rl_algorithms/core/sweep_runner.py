@@ -0,0 +1,255 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from rl_algorithms.core.rl_env.grid_world import GridWorld
+from rl_algorithms.core.algorithms.policy_iteration import PolicyIteration
+from rl_algorithms.core.algorithms.value_iteration import ValueIteration
+
+RESULT_DTYPE = np.dtype([
+    ('index', np.int64),
+    ('algorithm', 'U32'),
+    ('size', np.int64),
+    ('seed', np.int64),
+    ('gamma', np.float64),
+    ('main_transition_prob', np.float64),
+    ('iterations', np.int64),
+    ('sweeps', np.int64),
+    ('converged', bool),
+    ('delta', np.float64),
+    ('initial_value', np.float64),
+    ('build_time', np.float64),
+    ('solve_time', np.float64),
+    ('pid', np.int64),
+])
+
+
+def sweep_grid(sizes=(7,), seeds=(42,), gammas=(0.9,), main_transition_probs=(0.8,),
+               algorithms=(PolicyIteration, ValueIteration)) -> list:
+    """
+    Build every combination of the given hyperparameters.
+
+    Parameters
+    ----------
+    sizes : iterable of int, optional
+        Grid sizes (default is (7,)).
+    seeds : iterable of int, optional
+        Random seeds (default is (42,)).
+    gammas : iterable of float, optional
+        Discount factors (default is (0.9,)).
+    main_transition_probs : iterable of float, optional
+        Probabilities of taking the intended action (default is (0.8,)).
+    algorithms : iterable of type, optional
+        Algorithm classes taking ``(env, gamma, seed)`` (default is
+        PolicyIteration and ValueIteration).
+
+    Returns
+    -------
+    list of dict
+        One configuration per combination, numbered by its ``'index'``.
+    """
+    combinations = itertools.product(algorithms, sizes, seeds, gammas, main_transition_probs)
+    return [
+        {'index': i, 'algorithm': algorithm, 'size': size, 'seed': seed,
+         'gamma': gamma, 'main_transition_prob': prob}
+        for i, (algorithm, size, seed, gamma, prob) in enumerate(combinations)
+    ]
+
+
+def run_config(config: dict, theta: float = 1e-6, max_iterations: int = 1000,
+               max_sweeps: int = 100000) -> dict:
+    """
+    Build and solve one configuration.
+
+    The algorithm is driven like the UI drives it: policy evaluation steps
+    until `delta` drops below `theta`, then one policy improvement, until
+    the policy stops changing.
+
+    Parameters
+    ----------
+    config : dict
+        A configuration from `sweep_grid`.
+    theta : float, optional
+        Policy evaluation convergence threshold (default is 1e-6).
+    max_iterations : int, optional
+        Maximum number of policy improvements (default is 1000).
+    max_sweeps : int, optional
+        Maximum total number of evaluation steps (default is 100000).
+
+    Returns
+    -------
+    dict
+        The configuration and its results, with the fields of `RESULT_DTYPE`.
+    """
+    start = time.perf_counter()
+    env = GridWorld(size=config['size'], seed=config['seed'],
+                    main_transition_prob=config['main_transition_prob'])
+    algorithm = config['algorithm'](env, gamma=config['gamma'], seed=config['seed'])
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    iterations = sweeps = 0
+    delta = np.inf
+    converged = False
+    while iterations < max_iterations and sweeps < max_sweeps:
+        delta = np.inf
+        while not algorithm.has_converged(delta, theta) and sweeps < max_sweeps:
+            delta = algorithm.policy_evaluation_step()
+            sweeps += 1
+        iterations += 1
+        if algorithm.policy_improvement_step() and algorithm.has_converged(delta, theta):
+            converged = True
+            break
+    solve_time = time.perf_counter() - start
+
+    return {
+        'index': config['index'],
+        'algorithm': str(algorithm),
+        'size': config['size'],
+        'seed': config['seed'],
+        'gamma': config['gamma'],
+        'main_transition_prob': config['main_transition_prob'],
+        'iterations': iterations,
+        'sweeps': sweeps,
+        'converged': converged,
+        'delta': delta,
+        'initial_value': algorithm.values[env.initial_state],
+        'build_time': build_time,
+        'solve_time': solve_time,
+        'pid': os.getpid(),
+    }
+
+
+def results_table(records) -> np.ndarray:
+    """
+    Collect result records into a structured array sorted by configuration.
+
+    Parameters
+    ----------
+    records : iterable of dict
+        Records returned by `run_config`.
+
+    Returns
+    -------
+    np.ndarray
+        Structured array with dtype `RESULT_DTYPE`.
+    """
+    rows = [tuple(record[name] for name in RESULT_DTYPE.names) for record in records]
+    table = np.array(rows, dtype=RESULT_DTYPE)
+    return np.sort(table, order='index')
+
+
+def format_table(table: np.ndarray) -> str:
+    """
+    Format a results table as aligned text.
+
+    Parameters
+    ----------
+    table : np.ndarray
+        Structured array from `results_table`.
+
+    Returns
+    -------
+    str
+        One header line and one line per run.
+    """
+    names = table.dtype.names
+    cells = [[f"{row[name]:.4g}" if table.dtype[name].kind == 'f' else str(row[name])
+              for name in names] for row in table]
+    widths = [max([len(name)] + [len(line[i]) for line in cells]) for i, name in enumerate(names)]
+    lines = ['  '.join(name.rjust(w) for name, w in zip(names, widths))]
+    lines += ['  '.join(cell.rjust(w) for cell, w in zip(line, widths)) for line in cells]
+    return '\n'.join(lines)
+
+
+class SweepRunner:
+    """
+    Headless hyperparameter sweep over a process pool.
+
+    Every configuration is solved by `run_config` in a worker process, and
+    the results are streamed back in completion order.
+
+    Attributes
+    ----------
+    max_workers : int
+        Number of worker processes.
+    theta : float
+        Policy evaluation convergence threshold.
+    max_iterations : int
+        Maximum number of policy improvements per run.
+    max_sweeps : int
+        Maximum total number of evaluation steps per run.
+    wall_time : float
+        Duration of the last complete sweep, in seconds.
+    """
+
+    def __init__(self, max_workers: int = None, theta: float = 1e-6,
+                 max_iterations: int = 1000, max_sweeps: int = 100000):
+        """
+        Initialize the sweep runner.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Number of worker processes (default is one per CPU core).
+        theta : float, optional
+            Policy evaluation convergence threshold (default is 1e-6).
+        max_iterations : int, optional
+            Maximum number of policy improvements per run (default is 1000).
+        max_sweeps : int, optional
+            Maximum total number of evaluation steps per run (default is 100000).
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.theta = theta
+        self.max_iterations = max_iterations
+        self.max_sweeps = max_sweeps
+        self.wall_time = 0.0
+
+    def iter_results(self, configs):
+        """
+        Solve configurations in parallel, yielding each result as it finishes.
+
+        Parameters
+        ----------
+        configs : iterable of dict
+            Configurations from `sweep_grid`.
+
+        Yields
+        ------
+        dict
+            The result record of each configuration, in completion order.
+        """
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(run_config, config, self.theta, self.max_iterations, self.max_sweeps)
+                for config in configs
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        self.wall_time = time.perf_counter() - start
+
+    def run(self, configs, callback=None) -> np.ndarray:
+        """
+        Solve configurations in parallel and collect the results table.
+
+        Parameters
+        ----------
+        configs : iterable of dict
+            Configurations from `sweep_grid`.
+        callback : callable, optional
+            Called with each result record as soon as it finishes.
+
+        Returns
+        -------
+        np.ndarray
+            Structured array with dtype `RESULT_DTYPE`, sorted by configuration.
+        """
+        records = []
+        for record in self.iter_results(configs):
+            records.append(record)
+            if callback is not None:
+                callback(record)
+        return results_table(records)
@@ -11,10 +11,10 @@ sys.path.insert(0, BASE_DIR)
 from rl_algorithms.core.rl_env.grid_world import GridWorld
 from rl_algorithms.core.algorithms.policy_iteration import PolicyIteration
 from rl_algorithms.core.algorithms.value_iteration import ValueIteration
+from rl_algorithms.core.algorithms.q_learning import QLearning
+from rl_algorithms.core.algorithms.sarsa import SARSA
 from rl_algorithms.ui.grid_world_viz import GridWorldViz
 from rl_algorithms.ui.observers.ui_update_observer import UIUpdateObserver
-# 필요하다면 QLearning도 여기서 import
-# from core.algorithms.q_learning import QLearning
 
 def main(seed=42):
     """
@@ -32,7 +32,8 @@ def main(seed=42):
     algorithms = [
         PolicyIteration(env, gamma=0.9, seed=seed),
         ValueIteration(env, gamma=0.9, seed=seed),
-        # QLearning(env, gamma=0.9, alpha=0.1, epsilon=0.1, seed=seed) # 필요시 추가
+        QLearning(env, gamma=0.9, alpha=0.1, epsilon=0.1, seed=seed),
+        SARSA(env, gamma=0.9, alpha=0.1, epsilon=0.1, seed=seed),
     ]
 
     # 시각화 인스턴스 생성
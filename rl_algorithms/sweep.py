@@ -0,0 +1,52 @@
+# sweep.py
+import argparse
+import os
+import sys
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from rl_algorithms.core.algorithms.policy_iteration import PolicyIteration
+from rl_algorithms.core.algorithms.value_iteration import ValueIteration
+from rl_algorithms.core.sweep_runner import SweepRunner, sweep_grid, format_table
+
+ALGORITHMS = {'pi': PolicyIteration, 'vi': ValueIteration}
+
+
+def main(argv=None):
+    """
+    Run a headless hyperparameter sweep and print the results table.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Command line arguments (default is ``sys.argv[1:]``).
+    """
+    parser = argparse.ArgumentParser(description="Grid World hyperparameter sweep")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[7])
+    parser.add_argument('--seeds', type=int, nargs='+', default=[42])
+    parser.add_argument('--gammas', type=float, nargs='+', default=[0.9])
+    parser.add_argument('--probs', type=float, nargs='+', default=[0.8],
+                        help="main_transition_prob values")
+    parser.add_argument('--algorithms', nargs='+', choices=sorted(ALGORITHMS), default=['pi', 'vi'])
+    parser.add_argument('--workers', type=int, default=None, help="default: one per CPU core")
+    args = parser.parse_args(argv)
+
+    configs = sweep_grid(args.sizes, args.seeds, args.gammas, args.probs,
+                         [ALGORITHMS[name] for name in args.algorithms])
+    runner = SweepRunner(max_workers=args.workers)
+
+    def report(record):
+        print(f"[{record['index']}] {record['algorithm']} size={record['size']} "
+              f"gamma={record['gamma']} p={record['main_transition_prob']}: "
+              f"{record['sweeps']} sweeps in {record['solve_time']:.3f}s", flush=True)
+
+    table = runner.run(configs, callback=report)
+    print()
+    print(format_table(table))
+    print(f"\n{len(table)} runs on {runner.max_workers} workers in {runner.wall_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
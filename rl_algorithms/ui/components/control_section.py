@@ -1,5 +1,7 @@
 # ui/components/control_section.py
+import time
 import pygame
+from rl_algorithms.core.algorithms.base import TemporalDifferenceLearning
 from rl_algorithms.core.algorithms.policy_iteration import PolicyIteration
 from rl_algorithms.core.algorithms.value_iteration import ValueIteration
 
@@ -34,7 +36,13 @@ class ControlSection:
         Indicates whether policy evaluation has converged.
     is_policy_converged : bool
         Indicates whether policy improvement has converged.
+    pending_episodes : int
+        Episodes requested with "Generate Experience" that have not run yet.
+        They run a few at a time in `tick`, so the render loop keeps going.
     """
+    EPISODES_PER_CLICK = 1000
+    EVALUATION_EPISODES = 10000
+    FRAME_BUDGET = 0.02  # seconds of experience generation per frame
     def __init__(self, viz, left, top, width, font, colors):
         """
         Initializes the control section with buttons and counters.
@@ -66,6 +74,7 @@ class ControlSection:
         self.iteration_steps = 0
         self.is_eval_converged = False
         self.is_policy_converged = False
+        self.pending_episodes = 0
 
         self.cont_sec_title = {'text': 'Algorithm Control', 'rect': pygame.Rect(
             left+20, top+20, width, 40)}
@@ -94,6 +103,7 @@ class ControlSection:
         self.agent_control_buttons = [
             {'text': 'Move Agent', 'rect': pygame.Rect(left+20, top+420, width, 40), 'visible': True},
             {'text': 'Reset Agent', 'rect': pygame.Rect(left+20, top+470, width, 40), 'visible': True},
+            {'text': 'Evaluate Policy', 'rect': pygame.Rect(left+20, top+520, width, 40), 'visible': True},
         ]
 
         self.selected_action = None
@@ -121,6 +131,8 @@ class ControlSection:
             self._draw_policy_iteration_controls(screen)
         elif isinstance(current_alg, ValueIteration):
             self._draw_value_iteration_controls(screen)
+        elif isinstance(current_alg, TemporalDifferenceLearning):
+            self._draw_model_free_controls(screen, current_alg)
         # else: no controls visible if no algorithm chosen
 
         # Agent Control Title
@@ -191,6 +203,39 @@ class ControlSection:
                 t_rect = t.get_rect(center=button['rect'].center)
                 screen.blit(t, t_rect)
 
+    def _draw_model_free_controls(self, screen, current_alg):
+        """
+        Draws controls for model-free algorithms.
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            The surface to draw the controls on.
+        current_alg : TemporalDifferenceLearning
+            The currently selected algorithm.
+        """
+        episodes = f'Episodes: {current_alg.total_episodes}'
+        if self.pending_episodes:
+            episodes += f' (+{self.pending_episodes})'
+        text = self.font.render(episodes, True, self.BLACK)
+        text_rect = text.get_rect(center=self.eval_step_counter['rect'].center)
+        screen.blit(text, text_rect)
+
+        text = self.font.render(f'Episodes/s: {current_alg.episodes_per_second:.0f}', True, self.BLACK)
+        text_rect = text.get_rect(center=self.iter_step_counter['rect'].center)
+        screen.blit(text, text_rect)
+
+        for i, button in enumerate(self.algo_control_buttons):
+            if i not in (2, 4):
+                button['visible'] = False
+            else:
+                button['visible'] = True
+                pygame.draw.rect(screen, self.WHITE, button['rect'])
+                pygame.draw.rect(screen, self.BLACK, button['rect'], 1)
+                t = self.font.render(button['text'], True, self.BLACK)
+                t_rect = t.get_rect(center=button['rect'].center)
+                screen.blit(t, t_rect)
+
     def update_algorithm(self, algorithm):
         """
         Updates the control section when the algorithm is changed.
@@ -208,6 +253,7 @@ class ControlSection:
         self.iteration_steps = 0
         self.is_eval_converged = False
         self.is_policy_converged = False
+        self.pending_episodes = 0
 
     def update_evaluation(self, eval_data):
         """
@@ -249,6 +295,8 @@ class ControlSection:
                         self.reset_algorithm(current_alg)
                     elif button['text'] == 'Iterate one step':
                         self.algo_step(current_alg)
+                    elif button['text'] == 'Generate Experience':
+                        self.generate_experience(current_alg)
 
         # Agent control buttons
         for i, button in enumerate(self.agent_control_buttons):
@@ -260,6 +308,8 @@ class ControlSection:
                         self.move_agent(current_alg)
                     elif button['text'] == 'Reset Agent':
                         self.reset_agent(current_alg)
+                    elif button['text'] == 'Evaluate Policy':
+                        self.evaluate_policy(current_alg)
 
     def policy_evaluation(self, current_alg):
         """
@@ -276,13 +326,14 @@ class ControlSection:
             delta = current_alg.policy_evaluation_step()
             self.evaluation_steps += 1
             self.is_policy_converged = False
+            is_converged = current_alg.has_converged(delta)
             self.viz.notify_observers('policy_evaluation', {
                 'steps': self.evaluation_steps,
                 'delta': delta,
-                'converged': delta < 1e-6
+                'converged': is_converged
             })
 
-            if delta < 1e-6:
+            if is_converged:
                 self.viz.show_toast("Policy evaluation converged!")
                 self.is_eval_converged = True
 
@@ -322,6 +373,7 @@ class ControlSection:
         self.iteration_steps = 0
         self.is_eval_converged = False
         self.is_policy_converged = False
+        self.pending_episodes = 0
 
     def algo_step(self, current_alg):
         """
@@ -341,6 +393,37 @@ class ControlSection:
                 self.viz.show_toast("Algorithm converged!")
                 self.is_policy_converged = True
 
+    def generate_experience(self, current_alg):
+        """
+        Queues a batch of episodes for a model-free algorithm.
+
+        Parameters
+        ----------
+        current_alg : TemporalDifferenceLearning
+            The currently selected reinforcement learning algorithm.
+        """
+        self.pending_episodes += self.EPISODES_PER_CLICK
+        self.viz.show_toast(f"Generating {self.pending_episodes} episodes...")
+
+    def tick(self, current_alg):
+        """
+        Runs queued episodes for at most `FRAME_BUDGET` seconds.
+
+        Called once per frame by the render loop.
+
+        Parameters
+        ----------
+        current_alg : RLAlgorithm
+            The currently selected reinforcement learning algorithm.
+        """
+        if not self.pending_episodes or not isinstance(current_alg, TemporalDifferenceLearning):
+            return
+        deadline = time.perf_counter() + self.FRAME_BUDGET
+        while self.pending_episodes and time.perf_counter() < deadline:
+            n_episodes = min(self.pending_episodes, current_alg.n_envs)
+            current_alg.run_episodes(n_episodes)
+            self.pending_episodes -= n_episodes
+
     def move_agent(self, current_alg):
         """
         Moves the agent based on the current algorithm's policy.
@@ -372,4 +455,20 @@ class ControlSection:
         current_alg : RLAlgorithm
             The currently selected reinforcement learning algorithm.
         """
-        current_alg.reset_agent()
\ No newline at end of file
+        current_alg.reset_agent()
+
+    def evaluate_policy(self, current_alg):
+        """
+        Runs many episodes of the current policy and shows the empirical return.
+
+        Parameters
+        ----------
+        current_alg : RLAlgorithm
+            The currently selected reinforcement learning algorithm.
+        """
+        result = current_alg.evaluate_policy(n_episodes=self.EVALUATION_EPISODES)
+        low, high = result['return_ci']
+        self.viz.show_toast(
+            f"Return {result['mean_return']:.3f} ({low:.3f}~{high:.3f}), "
+            f"V(s0) {result['expected_return']:.3f}, success {result['success_rate']:.0%}",
+            duration=3000)
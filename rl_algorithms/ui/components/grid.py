@@ -185,12 +185,13 @@ class GridComponent:
             The currently selected reinforcement learning algorithm.
         """
         policy_probs = current_alg.policy[s]
-        env = self.viz.env
+        trace = self.viz.env.agent_trace
+        previous_state = trace[-2] if len(trace) > 1 else None
         selected_action = self.viz.control_section.selected_action
         for a, prob in enumerate(policy_probs):
             if prob > 0:
                 start_pos, end_pos = self.get_arrow_positions(rect, a)
-                color = self.RED if (len(env.agent_trace) > 1 and s == env.agent_trace[-2] and a == selected_action) else self.BLACK
+                color = self.RED if (s == previous_state and a == selected_action) else self.BLACK
                 self.draw_arrow(screen, a, start_pos, end_pos, color)
 
     def get_arrow_positions(self, rect, a):
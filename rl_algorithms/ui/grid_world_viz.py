@@ -190,6 +190,7 @@ class GridWorldViz:
                     pos = pygame.mouse.get_pos()
                     self.handle_click(pos)
 
+            self.control_section.tick(self.current_alg)
             self.screen.fill(self.colors['WHITE'])
             self.draw_all()
             pygame.display.flip()
@@ -0,0 +1,21 @@
+import numpy as np
+
+from rl_algorithms.core.rl_env.grid_world import GridWorld
+
+
+def test_transition_model_lists_successors_like_get_possible_successors():
+    env = GridWorld(size=9, seed=42)
+    for state in [10, 11, 12, 21, 30, 40, 41, 60, 70]:
+        env.set_wall(state)
+    env.set_wall(11, is_wall=False)
+
+    model = env.transition_probs
+    p = env.main_transition_prob
+    for state in range(env.n_states):
+        for action in range(len(env.actions)):
+            successors = env.get_possible_successors(state, action)
+            row = state * len(env.actions) + action
+            begin, end = model.indptr[row], model.indptr[row + 1]
+            assert model.indices[begin:end].tolist() == successors
+            expected = [p] + [(1 - p) / 2] * (len(successors) - 1)
+            assert np.array_equal(model.probs[begin:end], np.array(expected, dtype=env.dtype))
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from rl_algorithms.core.rl_env.grid_world import GridWorld
+from rl_algorithms.core.algorithms.value_iteration import ValueIteration
+
+
+def test_stochastic_policy_cannot_be_edited_in_place():
+    algorithm = ValueIteration(GridWorld(size=7, seed=42), seed=42)
+    algorithm.policy_sampler
+
+    with pytest.raises(ValueError):
+        algorithm.policy[0] = [0.0, 0.0, 0.0, 1.0]
+
+
+def test_assigning_policy_rebuilds_sampler():
+    algorithm = ValueIteration(GridWorld(size=7, seed=42), seed=42)
+    algorithm.policy_sampler
+
+    policy = algorithm.policy.copy()
+    policy[0] = [0.0, 0.0, 0.0, 1.0]
+    algorithm.policy = policy
+    policy[0] = [1.0, 0.0, 0.0, 0.0]
+
+    assert [algorithm.select_policy_action(0) for _ in range(10)] == [3] * 10
+
+
+def test_evaluate_policy_matches_values_and_keeps_rng():
+    algorithm = ValueIteration(GridWorld(size=7, seed=42), seed=42)
+    algorithm.run()
+    rng_state = algorithm.rng.get_state()[1].copy()
+
+    result = algorithm.evaluate_policy(n_episodes=4000, batch_size=1500)
+
+    low, high = result['return_ci']
+    assert low - 0.01 < result['expected_return'] < high + 0.01
+    assert result['success_rate'] == 1.0
+    assert np.array_equal(algorithm.rng.get_state()[1], rng_state)
+    first, second = (algorithm.evaluate_policy(n_episodes=50) for _ in range(2))
+    assert first['mean_return'] == second['mean_return']
+
+
+@pytest.mark.parametrize('n_episodes', [0, -1])
+def test_evaluate_policy_needs_an_episode(n_episodes):
+    algorithm = ValueIteration(GridWorld(size=7, seed=42), seed=42)
+
+    with pytest.raises(ValueError):
+        algorithm.evaluate_policy(n_episodes=n_episodes)
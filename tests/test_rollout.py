@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from rl_algorithms.core.rl_env.grid_world import GridWorld
+
+
+@pytest.mark.parametrize('policy', ['table', 'probs', 'callable'])
+def test_episode_budget_runs_episodes_in_one_batch(policy, monkeypatch):
+    env = GridWorld(size=7, seed=42)
+    policy = {
+        'table': np.full(env.n_states, -1),
+        'probs': np.full((env.n_states, 4), 0.25),
+        'callable': lambda state: 1,
+    }[policy]
+    batches = []
+    rollout_batch = env._rollout_batch
+    monkeypatch.setattr(env, '_rollout_batch',
+                        lambda *args: batches.append(args) or rollout_batch(*args))
+
+    result = env.rollout(policy, n_episodes=20, max_episode_steps=50)
+
+    assert len(batches) == 1
+    lengths = result['episode_lengths']
+    assert len(lengths) == 20
+    assert lengths.sum() == len(result['states'])
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    assert (result['states'][starts] == env.initial_state).all()
+    # Within an episode each step starts where the previous one ended
+    inner = np.setdiff1d(np.arange(1, lengths.sum()), starts)
+    assert (result['states'][inner] == result['next_states'][inner - 1]).all()
+    ends = np.cumsum(lengths) - 1
+    assert (result['dones'][ends] | (lengths == 50)).all()
+    assert not np.delete(result['dones'], ends).any()
+
+
+def test_step_budget_keeps_sequential_episodes():
+    env = GridWorld(size=7, seed=42)
+    result = env.rollout(np.full(env.n_states, -1), n_steps=100, n_episodes=3,
+                         max_episode_steps=30)
+
+    assert len(result['states']) <= 100
+    assert result['episode_lengths'].sum() == len(result['states'])
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from rl_algorithms.core.rl_env.grid_world import GridWorld
+from rl_algorithms.core.algorithms.q_learning import QLearning
+from rl_algorithms.core.algorithms.sarsa import SARSA
+from rl_algorithms.core.algorithms.value_iteration import ValueIteration
+
+
+@pytest.fixture(scope='module')
+def optimal_values():
+    env = GridWorld(size=7, seed=42)
+    algorithm = ValueIteration(env, gamma=0.9, seed=42)
+    algorithm.run()
+    return algorithm.values
+
+
+def test_duplicate_pairs_take_one_averaged_step():
+    algorithm = QLearning(GridWorld(size=7, seed=42), alpha=0.1)
+    states = np.zeros(64, dtype=np.int64)
+    actions = np.ones(64, dtype=np.int64)
+    targets = np.linspace(0.0, 2.0, 64)
+
+    algorithm.apply_td_targets(states, actions, targets)
+
+    assert algorithm.q_values[0, 1] == pytest.approx(0.1 * targets.mean())
+    assert np.count_nonzero(algorithm.q_values) == 1
+
+
+@pytest.mark.parametrize('algorithm_class, tolerance', [(QLearning, 0.05), (SARSA, 0.25)])
+def test_batched_episodes_stay_finite_and_approach_value_iteration(algorithm_class, tolerance,
+                                                                   optimal_values):
+    env = GridWorld(size=7, seed=42)
+    algorithm = algorithm_class(env, gamma=0.9, seed=1, alpha=0.1, epsilon=0.2, n_envs=64)
+    mask = algorithm.update_mask
+    initial_error = np.abs(algorithm.values[mask] - optimal_values[mask]).mean()
+
+    # The UI calls run_episodes(n_envs) once per frame
+    for _ in range(300):
+        algorithm.run_episodes(64)
+
+    assert np.isfinite(algorithm.q_values).all()
+    error = np.abs(algorithm.values[mask] - optimal_values[mask]).mean()
+    assert error < tolerance < initial_error